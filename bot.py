@@ -5,14 +5,35 @@ import nextcord
 from nextcord.ext import commands
 
 import config
+import database.migrator
+import database.pool
 import database.preloaded
+import database.query_stats
+import database.sql_fetcher
+from utils import date_parser, google_clients
 from utils.scheduler import Scheduler
 
 
 async def main():
+    # Open the pool of connections to the database
+    await database.pool.connect()
+
+    # Bring the database schema up to date
+    await database.migrator.migrate()
+
+    # Check that all the stored queries are valid against the current schema
+    if config.validate_queries:
+        await database.sql_fetcher.validate()
+
     # Preload necessary data from the database
     await database.preloaded.load()
 
+    # Build the Google API clients before the cogs which use them are loaded
+    google_clients.warm_up()
+
+    # Load the language data for parsing dates before the first command which needs it
+    date_parser.warm_up()
+
     # allows privledged intents for monitoring members joining, roles editing, and role assignments (has to be enabled for the bot in Discord dev)
     intents = nextcord.Intents.default()
     intents.guilds = True
@@ -27,6 +48,17 @@ async def main():
         if os.path.exists(os.path.join("modules", folder, "cog.py")):
             bot.load_extension(f"modules.{folder}.cog")
 
+    @bot.application_command_before_invoke
+    async def set_current_command(interaction: nextcord.Interaction[commands.Bot]):
+        # attach the command to any slow queries it runs
+        if interaction.application_command is not None:
+            database.query_stats.current_command.set(interaction.application_command.qualified_name)
+
+    # Keep preloaded data and the slash command options derived from it up to date
+    # (the commands are synced after the cogs, which were loaded first, have updated their options)
+    database.preloaded.add_listener(lambda: bot.sync_application_commands(guild_id=config.guild_id))
+    await database.preloaded.listen()
+
     @bot.event
     async def on_ready():
         """When discord is connected"""
@@ -40,7 +72,10 @@ async def main():
         Scheduler(bot)
 
     # Run Discord bot
-    await bot.start(config.token)
+    try:
+        await bot.start(config.token)
+    finally:
+        await database.pool.close()
 
 
 if __name__ == "__main__":
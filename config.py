@@ -1,7 +1,6 @@
 import os
 from typing import Optional
 
-import asyncpg
 import nextcord
 from dotenv.main import load_dotenv
 
@@ -19,25 +18,27 @@ def guild() -> nextcord.Guild:
     return _guild
 
 
-_conn: Optional[asyncpg.Connection] = None  # The global connection to the database
+# Database setup
+database_url = os.getenv("DATABASE_URL", "")
+database_pool_min_size = int(os.getenv("DATABASE_POOL_MIN_SIZE", "2"))
+database_pool_max_size = int(os.getenv("DATABASE_POOL_MAX_SIZE", "10"))
+database_statement_cache_size = int(os.getenv("DATABASE_STATEMENT_CACHE_SIZE", "256"))
+database_max_idle_time = float(os.getenv("DATABASE_MAX_IDLE_TIME", "300"))
+database_retry_attempts = int(os.getenv("DATABASE_RETRY_ATTEMPTS", "5"))
+database_retry_delay = float(os.getenv("DATABASE_RETRY_DELAY", "1"))
 
+# Whether to prepare every stored query against the database at startup to catch broken queries early
+validate_queries = os.getenv("VALIDATE_QUERIES", "false").lower() == "true"
 
-async def get_connection() -> asyncpg.Connection:
-    """Get a connection to the database.
+# Queries taking at least this many seconds are written to the slow query log
+slow_query_threshold = float(os.getenv("SLOW_QUERY_THRESHOLD", "0.25"))
+slow_query_log = os.getenv("SLOW_QUERY_LOG", "slow_queries.log")
 
-    If a connection has not yet been established or the current connection is closed, a new connection will be established.
-
-    Returns:
-        asyncpg.Connection: The connection to the database.
-    """
-    global _conn
-    if _conn is None or _conn.is_closed():
-        _conn = await asyncpg.connect(os.getenv("DATABASE_URL"))  # type: ignore
-    assert isinstance(
-        _conn, asyncpg.Connection
-    ), "A connection to the database could not be established."
-    return _conn
+# Number of seconds before the in-memory directory of groups and campuses is reloaded
+group_directory_ttl = float(os.getenv("GROUP_DIRECTORY_TTL", "3600"))
 
+# Number of seconds before the in-memory directory of courses is reloaded
+course_directory_ttl = float(os.getenv("COURSE_DIRECTORY_TTL", "3600"))
 
 # Google client configuration
 google_config = {
@@ -53,6 +54,17 @@ google_config = {
     "client_x509_cert_url": os.getenv("GOOGLE_CLIENT_X509_CERT_URL"),
 }
 
+# Maximum number of Google API requests which may run at once, and seconds before one is abandoned
+google_api_max_workers = int(os.getenv("GOOGLE_API_MAX_WORKERS", "8"))
+google_api_timeout = float(os.getenv("GOOGLE_API_TIMEOUT", "30"))
+# Seconds before a batch of Google API requests is abandoned
+google_api_batch_timeout = float(os.getenv("GOOGLE_API_BATCH_TIMEOUT", "120"))
+
+# Seconds before the events of a calendar kept in memory are synced with Google Calendar again
+calendar_sync_interval = float(os.getenv("CALENDAR_SYNC_INTERVAL", "60"))
+# Days after they end that events are still downloaded when the whole calendar is synced
+calendar_sync_history_days = float(os.getenv("CALENDAR_SYNC_HISTORY_DAYS", "7"))
+
 # Google Drive folder IDs
 drive_folder_id = os.getenv("DRIVE_FOLDER_ID", "")
 drive_guidelines_url = os.getenv("DRIVE_GUIDLELINES_URL", "")
@@ -26,8 +26,8 @@ class Campus:
     @cached_property
     def channel(self) -> nextcord.TextChannel:
         """The channel associated with this Campus."""
-        channel = nextcord.utils.get(config.guild().text_channels, id=self.__channel_id)
-        assert channel is not None
+        channel = config.guild().get_channel(self.__channel_id)
+        assert isinstance(channel, nextcord.TextChannel)
         return channel
 
     @classmethod
@@ -0,0 +1,30 @@
+from typing import Dict, Mapping
+
+import config
+from database import sql
+from database.ttl_directory import TtlDirectory
+
+
+class CourseDirectory(TtlDirectory):
+    """An in-memory index of all the courses in the database, by channel.
+
+    Call `invalidate()` after modifying the categories table.
+    """
+
+    def __init__(self, ttl: float):
+        super().__init__(ttl)
+        self.__names_by_channel: Dict[int, str] = {}
+
+    async def names_by_channel(self) -> Mapping[int, str]:
+        """The names of all the courses, keyed by the IDs of their channels."""
+        await self._ensure_fresh()
+        return self.__names_by_channel
+
+    async def _load(self) -> None:
+        records = await sql.select.many("categories", ("name", "channel"))
+        self.__names_by_channel = {
+            record["channel"]: record["name"] for record in records if record["channel"]
+        }
+
+
+directory = CourseDirectory(ttl=config.course_directory_ttl)
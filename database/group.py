@@ -31,10 +31,15 @@ class Group:
         """The campus this Group belongs to"""
         return self.__campus
 
+    @property
+    def role_id(self) -> int:
+        """The ID of the Role associated with this Group."""
+        return self.__role_id
+
     @cached_property
     def role(self) -> nextcord.Role:
         """The Role associated with this Group."""
-        role = nextcord.utils.get(config.guild().roles, id=self.__role_id)
+        role = config.guild().get_role(self.__role_id)
         assert role is not None
         return role
 
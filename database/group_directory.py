@@ -0,0 +1,72 @@
+from typing import Collection, Dict, List, Optional, Tuple
+
+import nextcord
+
+import config
+from database.campus import Campus
+from database.group import Group
+from database.ttl_directory import TtlDirectory
+
+
+class GroupDirectory(TtlDirectory):
+    """An in-memory index of all the groups and campuses in the database.
+
+    Call `invalidate()` after modifying the groups or campuses tables.
+    """
+
+    def __init__(self, ttl: float):
+        super().__init__(ttl)
+        self.__groups: Collection[Group] = []
+        self.__campuses: Collection[Campus] = []
+        self.__by_id: Dict[int, Group] = {}
+        self.__by_role: Dict[int, Group] = {}
+        self.__by_campus_year: Dict[Tuple[int, int], Group] = {}
+        self.__campuses_by_id: Dict[int, Campus] = {}
+
+    async def groups(self) -> Collection[Group]:
+        """All the groups in the database."""
+        await self._ensure_fresh()
+        return self.__groups
+
+    async def campuses(self) -> Collection[Campus]:
+        """All the campuses in the database."""
+        await self._ensure_fresh()
+        return self.__campuses
+
+    async def get_group(self, group_id: int) -> Optional[Group]:
+        """Find the group with the given ID, or None if there is no such group."""
+        await self._ensure_fresh()
+        return self.__by_id.get(group_id)
+
+    async def get_group_by_role(self, role_id: int) -> Optional[Group]:
+        """Find the group whose role has the given ID, or None if there is no such group."""
+        await self._ensure_fresh()
+        return self.__by_role.get(role_id)
+
+    async def get_group_by_campus_year(self, campus_id: int, grad_year: int) -> Optional[Group]:
+        """Find the group of the given campus which graduates in the given year, or None if there is no such group."""
+        await self._ensure_fresh()
+        return self.__by_campus_year.get((campus_id, grad_year))
+
+    async def get_campus(self, campus_id: int) -> Optional[Campus]:
+        """Find the campus with the given ID, or None if there is no such campus."""
+        await self._ensure_fresh()
+        return self.__campuses_by_id.get(campus_id)
+
+    async def groups_of(self, member: nextcord.Member) -> List[Group]:
+        """Find all the groups whose roles the given member has."""
+        await self._ensure_fresh()
+        return [self.__by_role[role.id] for role in member.roles if role.id in self.__by_role]
+
+    async def _load(self) -> None:
+        groups = await Group.get_groups()
+        campuses = await Campus.get_campuses()
+        self.__groups = groups
+        self.__campuses = campuses
+        self.__by_id = {group.id: group for group in groups}
+        self.__by_role = {group.role_id: group for group in groups}
+        self.__by_campus_year = {(group.campus.id, group.grad_year): group for group in groups}
+        self.__campuses_by_id = {campus.id: campus for campus in campuses}
+
+
+directory = GroupDirectory(ttl=config.group_directory_ttl)
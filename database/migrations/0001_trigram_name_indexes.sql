@@ -0,0 +1,6 @@
+-- Allow name searches to use the indexable % operator instead of computing similarity() for every row
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS people_name_trgm_idx ON people USING gin (name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS people_surname_trgm_idx ON people USING gin (surname gin_trgm_ops);
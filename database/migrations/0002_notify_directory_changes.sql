@@ -0,0 +1,20 @@
+-- Notify listeners on the directory_changed channel whenever the groups or campuses change,
+-- so that the bot can reload its preloaded data without restarting
+CREATE OR REPLACE FUNCTION notify_directory_changed() RETURNS trigger AS $$
+BEGIN
+	PERFORM pg_notify('directory_changed', TG_TABLE_NAME);
+	RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS groups_notify_directory_changed ON groups;
+
+CREATE TRIGGER groups_notify_directory_changed
+	AFTER INSERT OR UPDATE OR DELETE ON groups
+	FOR EACH STATEMENT EXECUTE FUNCTION notify_directory_changed();
+
+DROP TRIGGER IF EXISTS campuses_notify_directory_changed ON campuses;
+
+CREATE TRIGGER campuses_notify_directory_changed
+	AFTER INSERT OR UPDATE OR DELETE ON campuses
+	FOR EACH STATEMENT EXECUTE FUNCTION notify_directory_changed();
@@ -0,0 +1,57 @@
+"""
+This module applies versioned changes to the database schema.
+
+Each migration is a `.sql` file in `database/migrations` whose name starts with
+its version number followed by an underscore and a short description (eg.
+`0002_add_course_codes.sql`). Migrations are applied in order of version, each
+in its own transaction, and the versions which were applied are recorded in
+the `schema_migrations` table so that every migration runs exactly once.
+
+To change the schema, add a new file with the next version number. Never edit
+a migration which has already been applied.
+"""
+
+import os
+from typing import List, Tuple
+
+from database import pool, sql_fetcher
+
+MIGRATIONS_FOLDER = ("database", "migrations")
+
+# An arbitrary key for the advisory lock which stops two instances of the bot migrating at once
+__LOCK_KEY = 7_335_201
+
+
+async def migrate() -> None:
+    """Apply all the migrations which have not yet been applied to the database."""
+    async with pool.acquire() as conn:
+        await conn.execute(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            " version INTEGER PRIMARY KEY,"
+            " name TEXT NOT NULL,"
+            " applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+        )
+        for version, file_name in __migration_files():
+            async with conn.transaction():
+                await conn.execute("SELECT pg_advisory_xact_lock($1)", __LOCK_KEY)
+                if await conn.fetchval(
+                    "SELECT EXISTS (SELECT 1 FROM schema_migrations WHERE version = $1)", version
+                ):
+                    continue
+                print(f"Applying database migration {file_name}")
+                await conn.execute(sql_fetcher.fetch(*MIGRATIONS_FOLDER, file_name))
+                await conn.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES ($1, $2)",
+                    version,
+                    file_name,
+                )
+
+
+def __migration_files() -> List[Tuple[int, str]]:
+    """Returns a list of (version, file name) pairs for every migration, sorted by version."""
+    migrations = []
+    for file_name in os.listdir(os.path.join(*MIGRATIONS_FOLDER)):
+        if file_name.endswith(".sql"):
+            version, _, _ = file_name.partition("_")
+            migrations.append((int(version), file_name))
+    return sorted(migrations)
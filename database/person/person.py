@@ -1,7 +1,6 @@
-from typing import Iterable, Sequence, Set, Tuple
+from typing import Iterable, Mapping, Optional, Sequence, Set, Tuple
 
-import config
-from database import sql, sql_fetcher
+from database import pool, sql, sql_fetcher
 
 
 class Person:
@@ -36,6 +35,16 @@ class Person:
         """A comma separated string of underlined email addresses of this person."""
         return ", ".join([f"__{email}__" for email in self.__emails.split(", ") if email])
 
+    def with_email(self, email: str) -> "Person":
+        """Returns a copy of this person with the given email address added, without querying the database."""
+        emails = [*(e for e in self.emails if e), email]
+        return Person(self.__id, self.__name, ", ".join(emails), self.__categories)
+
+    def without_email(self, email: str) -> "Person":
+        """Returns a copy of this person with the given email address removed, without querying the database."""
+        emails = [e for e in self.emails if e and e != email]
+        return Person(self.__id, self.__name, ", ".join(emails), self.__categories)
+
     def __no_duplicates(self, list_as_str: str, sep_in: str = ",", sep_out: str = ", ") -> str:
         return (
             sep_out.join({elem.strip() for elem in list_as_str.split(sep_in)})
@@ -59,32 +68,38 @@ class Person:
         return {cls(*record) for record in records}
 
     @classmethod
-    async def search_by_name(cls, name: str) -> Sequence[Tuple["Person", float]]:
-        """Searches the database for all people whose name or surname reasonably match the input and returns a sequence of (person, similarity) pairs sorted by decreasing similarity.
+    async def search_weighted(
+        cls,
+        words: Sequence[str],
+        channel_id: Optional[int],
+        email: Optional[str],
+        weights: Mapping[str, float],
+    ) -> Sequence[Tuple["Person", float]]:
+        """Scores every person against all the given criteria at once, in a single query, and returns a sequence of (person, weight) pairs for each person who matched at least one of them.
+
+        Each word of the name contributes `weights["word"]` multiplied by its similarity to the person's name or surname, being linked to the channel contributes `weights["channel"]`, and owning the email address contributes `weights["email"]`.
 
         Args:
-            name (str): The name of the person to search for.
+            words (Sequence[str]): The words of the name of the person to search for.
+            channel_id (Optional[int]): The ID of a channel the person is linked to.
+            email (Optional[str]): An email address of the person.
+            weights (Mapping[str, float]): The weight of each kind of match, keyed by "word", "channel" and "email".
 
         Returns:
-            Sequence[Tuple[Person, float]]: A sequence of results where each result is a tuple of the person that matched as well as a similarity score between 0 and 1.
-        """
-        conn = await config.get_connection()
-        query = sql_fetcher.fetch("database", "person", "queries", "search_people.sql")
-        return [(cls(*record[:-1]), record[-1]) for record in await conn.fetch(query, name)]
-
-    @classmethod
-    async def search_by_channel(cls, channel_id: int) -> Iterable["Person"]:
-        """
-        Searches the database for all people whose channel matches the input and returns an iterable of these.
-        """
-        return await cls.__search_people("person_category_categories_view", channel=channel_id)
-
-    @classmethod
-    async def search_by_email(cls, email: str) -> Iterable["Person"]:
-        """
-        Searches the database for all people whose email matches the input and returns an iterable of these.
+            Sequence[Tuple[Person, float]]: A sequence of results where each result is a tuple of the person that matched and their total weight.
         """
-        return await cls.__search_people("emails", email=email)
+        query = sql_fetcher.fetch("database", "person", "queries", "search_people_weighted.sql")
+        async with pool.acquire() as conn:
+            records = await conn.fetch(
+                query,
+                list(words),
+                channel_id,
+                email,
+                weights["word"],
+                weights["channel"],
+                weights["email"],
+            )
+        return [(cls(*record[:-1]), record[-1]) for record in records]
 
     def __eq__(self, other):
         """Compares them by ID"""
@@ -94,17 +109,3 @@ class Person:
 
     def __hash__(self):
         return hash(self.__id)
-
-    @classmethod
-    async def __search_people(cls, table: str, **conditions) -> Iterable["Person"]:
-        """Searches the database using a given a table and some kwarg conditions and returns a list of people found.
-
-        Args:
-            table (str): The name of the table to search in.
-            **conditions: The column names and values that the found records should have.
-
-        Returns:
-            Iterable[Person]: An iterable of the people found.
-        """
-        records = await sql.select.many(table, ("person",), **conditions)
-        return {await Person.get_person(record["person"]) for record in records}
@@ -0,0 +1,32 @@
+WITH scores AS (
+		SELECT people.id AS person,
+			$4::float8 * GREATEST(
+				similarity(people.name, word),
+				similarity(people.surname, word)
+			) AS weight
+		FROM unnest($1::text []) AS word
+			JOIN people ON people.name % word
+			OR people.surname % word
+		UNION ALL
+		SELECT DISTINCT person,
+			$5::float8 AS weight
+		FROM person_category_categories_view
+		WHERE channel = $2
+		UNION ALL
+		SELECT person,
+			$6::float8 AS weight
+		FROM emails
+		WHERE email = $3
+	)
+SELECT people_view.id,
+	people_view.name,
+	people_view.emails,
+	people_view.categories,
+	totals.weight
+FROM (
+		SELECT person,
+			sum(weight) AS weight
+		FROM scores
+		GROUP BY person
+	) AS totals
+	JOIN people_view ON people_view.id = totals.person
@@ -0,0 +1,234 @@
+"""
+This module manages the pool of connections to the database.
+
+Call `await connect()` once at startup (before anything touches the database),
+then borrow a connection wherever one is needed with:
+
+    async with pool.acquire() as conn:
+        ...
+
+The connection is returned to the pool as soon as the block exits, so keep the
+block as short as possible and never hold on to `conn` after it.
+
+To run several steps as a single unit of work, wrap them in:
+
+    async with pool.unit_of_work():
+        ...
+
+Every query run inside the block (including those run by `database.sql` and
+any function called from the block) uses the same connection and is committed
+together when the block exits, or rolled back if it raises.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Set, TypeVar
+
+import asyncpg
+
+import config
+
+from . import query_stats
+
+_pool: Optional[asyncpg.Pool] = None
+_lock = asyncio.Lock()
+
+# Tasks running in the background which must be kept alive until they finish
+_background_tasks: Set[asyncio.Task] = set()
+
+T = TypeVar("T")
+
+# The connection pinned by the unit of work currently running in this context, if any
+_pinned: ContextVar[Optional[asyncpg.Connection]] = ContextVar("pinned_connection", default=None)
+
+
+class PoolStats:
+    """Counters describing how the connection pool is being used."""
+
+    def __init__(self) -> None:
+        self.in_use = 0
+        self.waiting = 0
+        self.acquisitions = 0
+        self.reconnects = 0
+        self.total_acquire_time = 0.0
+        self.max_acquire_time = 0.0
+
+    @property
+    def size(self) -> int:
+        """The number of connections currently open in the pool."""
+        return _pool.get_size() if _pool is not None else 0
+
+    @property
+    def idle(self) -> int:
+        """The number of open connections which are not currently in use."""
+        return _pool.get_idle_size() if _pool is not None else 0
+
+    @property
+    def mean_acquire_time(self) -> float:
+        """The average number of seconds spent waiting to acquire a connection."""
+        return self.total_acquire_time / self.acquisitions if self.acquisitions else 0.0
+
+    def record_acquire(self, seconds: float) -> None:
+        self.acquisitions += 1
+        self.total_acquire_time += seconds
+        self.max_acquire_time = max(self.max_acquire_time, seconds)
+
+    def __str__(self) -> str:
+        return (
+            f"size={self.size} in_use={self.in_use} idle={self.idle} waiting={self.waiting}"
+            f" acquisitions={self.acquisitions} reconnects={self.reconnects}"
+            f" mean_acquire={self.mean_acquire_time * 1000:.1f}ms"
+            f" max_acquire={self.max_acquire_time * 1000:.1f}ms"
+        )
+
+
+stats = PoolStats()
+
+
+async def connect() -> asyncpg.Pool:
+    """Create the connection pool, retrying with exponential backoff if the database is unreachable.
+
+    If the pool already exists and is open, it is returned as is.
+
+    Returns:
+        asyncpg.Pool: The pool of connections to the database.
+    """
+    global _pool
+    async with _lock:
+        if _pool is not None and not _pool.is_closing():
+            return _pool
+        _pool = await __with_retries(
+            lambda: asyncpg.create_pool(
+                config.database_url,
+                min_size=config.database_pool_min_size,
+                max_size=config.database_pool_max_size,
+                max_inactive_connection_lifetime=config.database_max_idle_time,
+                # statements are prepared once per connection and reused from this cache
+                statement_cache_size=config.database_statement_cache_size,
+            )
+        )
+        assert _pool is not None, "A connection pool to the database could not be established."
+        return _pool
+
+
+async def __with_retries(connect_once: Callable[[], Awaitable[T]]) -> T:
+    """Connect to the database, retrying with exponential backoff if it is unreachable.
+
+    Args:
+        connect_once (Callable[[], Awaitable[T]]): A function which makes a single attempt to connect.
+
+    Raises:
+        ConnectionError: If every one of the `config.database_retry_attempts` attempts failed.
+    """
+    delay = config.database_retry_delay
+    for attempt in range(1, config.database_retry_attempts + 1):
+        try:
+            return await connect_once()
+        except (OSError, asyncpg.PostgresError) as e:
+            if attempt == config.database_retry_attempts:
+                raise ConnectionError("Unable to connect to the database.") from e
+            print(f"Database connection attempt {attempt} failed ({e}). Retrying in {delay}s.")
+            await asyncio.sleep(delay)
+            delay *= 2
+    raise ConnectionError("Unable to connect to the database.")
+
+
+async def close() -> None:
+    """Gracefully close all the connections in the pool."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+@asynccontextmanager
+async def acquire() -> AsyncIterator[asyncpg.Connection]:
+    """Borrow a connection from the pool for the duration of an `async with` block.
+
+    If the pool has not been created yet or was closed, it will be (re)created first. Inside a unit
+    of work, the connection pinned by it is yielded instead.
+
+    Yields:
+        asyncpg.Connection: A connection to the database, instrumented to record the duration of each query.
+    """
+    pinned = _pinned.get()
+    if pinned is not None:
+        yield pinned
+        return
+    pool = _pool if _pool is not None and not _pool.is_closing() else await __reconnect()
+    stats.waiting += 1
+    start = time.perf_counter()
+    try:
+        conn = await pool.acquire()
+    finally:
+        stats.waiting -= 1
+    stats.record_acquire(time.perf_counter() - start)
+    stats.in_use += 1
+    try:
+        yield query_stats.InstrumentedConnection(conn)
+    finally:
+        stats.in_use -= 1
+        await pool.release(conn)
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncIterator[asyncpg.Connection]:
+    """Pin a single connection for the duration of an `async with` block and run everything in the block in one transaction.
+
+    Nested units of work become savepoints within the outer one. Queries inside the block must not run concurrently (eg. with `asyncio.gather`), since they all share one connection.
+
+    Yields:
+        asyncpg.Connection: The pinned connection.
+    """
+    pinned = _pinned.get()
+    if pinned is not None:
+        async with pinned.transaction():
+            yield pinned
+        return
+    async with acquire() as conn, conn.transaction():
+        token = _pinned.set(conn)
+        try:
+            yield conn
+        finally:
+            _pinned.reset(token)
+
+
+async def __reconnect() -> asyncpg.Pool:
+    if _pool is not None:
+        stats.reconnects += 1
+    return await connect()
+
+
+async def listen(channel: str, callback: Callable[[str], Any]) -> None:
+    """Subscribe to notifications sent with NOTIFY on the given channel, calling `callback` with the payload of each one.
+
+    Listening requires a connection which stays open, so a dedicated connection outside of the pool is used. If that connection is lost, it is re-established in the background, retrying with the same backoff as `connect()` for as long as it takes. Notifications sent while disconnected are lost, so `callback` is called once with an empty payload after reconnecting.
+
+    Args:
+        channel (str): The name of the notification channel to listen on.
+        callback (Callable[[str], Any]): A function to call with the payload of each notification.
+    """
+    conn = await __with_retries(lambda: asyncpg.connect(config.database_url))
+
+    def on_termination(_: asyncpg.Connection) -> None:
+        task = asyncio.create_task(__resubscribe(channel, callback))
+        # keep a reference to the task so that it isn't garbage collected before it finishes
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    conn.add_termination_listener(on_termination)
+    await conn.add_listener(channel, lambda _conn, _pid, _channel, payload: callback(payload))
+
+
+async def __resubscribe(channel: str, callback: Callable[[str], Any]) -> None:
+    while True:
+        try:
+            await listen(channel, callback)
+        except ConnectionError as e:
+            print(f"Unable to listen on {channel} ({e}). Retrying.")
+        else:
+            # something may have changed while the connection was down
+            callback("")
+            return
@@ -8,19 +8,83 @@ __load() function, then import it wherever you need it.
 
 Just make sure you call await load() sometime before you use any of the data in
 this module.
+
+The data is reloaded whenever the groups or campuses tables change (once
+listen() has been called). If you derived something from it which must be kept
+up to date, such as the choices of a slash command option, register a callback
+with add_listener() to update it after each reload.
 """
 
-from typing import Collection
+import asyncio
+import traceback
+from typing import Awaitable, Callable, Collection, List, Optional
 
 from database.campus import Campus
 
+from . import pool
 from .group import Group
+from .group_directory import directory
 
 groups: Collection[Group] = []
 campuses: Collection[Campus] = []
 
+__listeners: List[Callable[[], Awaitable[None]]] = []
+__pending_reload: Optional[asyncio.Task] = None
+# Whether a change was notified which the data hasn't been reloaded since
+__changed = False
+
+# Seconds to wait after a change before reloading, so that a burst of changes causes a single reload
+__RELOAD_DELAY = 2.0
+
 
 async def load():
     global groups, campuses
-    groups = await Group.get_groups()
-    campuses = await Campus.get_campuses()
+    await directory.refresh()
+    groups = await directory.groups()
+    campuses = await directory.campuses()
+
+
+def add_listener(callback: Callable[[], Awaitable[None]]) -> None:
+    """Register a coroutine function to be awaited every time the data is reloaded after a change. Callbacks are awaited in the order they were added."""
+    __listeners.append(callback)
+
+
+async def reload() -> None:
+    """Reload the data from the database and notify all the listeners.
+
+    A listener which raises doesn't prevent the others from being notified. Its error is logged instead.
+    """
+    await load()
+    for callback in __listeners:
+        try:
+            await callback()
+        except Exception as e:
+            print(f"A listener failed to handle reloaded data: {e}")
+            traceback.print_exception(e)
+
+
+async def listen() -> None:
+    """Start reloading the data whenever the groups or campuses tables change."""
+    await pool.listen("directory_changed", __schedule_reload)
+
+
+def __schedule_reload(_: str) -> None:
+    global __pending_reload, __changed
+    directory.invalidate()
+    __changed = True
+    # a reload which is already running picks up the change once it finishes
+    if __pending_reload is None or __pending_reload.done():
+        __pending_reload = asyncio.create_task(__delayed_reload())
+
+
+async def __delayed_reload() -> None:
+    global __changed
+    # reload again if another change was notified while reloading
+    while __changed:
+        await asyncio.sleep(__RELOAD_DELAY)
+        __changed = False
+        try:
+            await reload()
+        except Exception as e:
+            print(f"Failed to reload the preloaded data: {e}")
+            traceback.print_exception(e)
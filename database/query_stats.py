@@ -0,0 +1,194 @@
+"""
+This module records how long database queries take.
+
+Every connection handed out by `database.pool.acquire()` is wrapped in an
+`InstrumentedConnection`, so all queries (whether built by `database.sql` or
+run directly with `conn.fetch` and friends) are measured per statement and per
+table. Queries slower than `config.slow_query_threshold` seconds are appended
+to the slow query log (from a background thread) along with the slash command
+which triggered them.
+"""
+
+import bisect
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import asyncpg
+
+import config
+
+# The qualified name of the slash command currently being run in this context (eg. "email of")
+current_command: ContextVar[Optional[str]] = ContextVar("current_command", default=None)
+
+# Upper bounds (in milliseconds) of the buckets of the latency histograms
+HISTOGRAM_BUCKETS: Sequence[float] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+__TABLE_REGEX = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+([\w.]+)", re.IGNORECASE)
+__WHITESPACE_REGEX = re.compile(r"\s+")
+
+# A single thread, so that slow queries are appended to the log in the order they were recorded
+__log_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow_query_log")
+
+
+class QueryStats:
+    """Aggregated measurements of a group of queries."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        # the last bucket counts the queries slower than every bound in HISTOGRAM_BUCKETS
+        self.histogram = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+
+    @property
+    def mean_time(self) -> float:
+        """The average duration of the queries in seconds."""
+        return self.total_time / self.count if self.count else 0.0
+
+    def record(self, seconds: float, rows: int, error: bool) -> None:
+        self.count += 1
+        self.errors += error
+        self.rows += rows
+        self.total_time += seconds
+        self.max_time = max(self.max_time, seconds)
+        self.histogram[bisect.bisect_left(HISTOGRAM_BUCKETS, seconds * 1000)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """An upper bound (in milliseconds) on the duration of the given fraction of the queries, according to the histogram."""
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(HISTOGRAM_BUCKETS, self.histogram):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.max_time * 1000
+
+
+statements: Dict[str, QueryStats] = {}
+tables: Dict[str, QueryStats] = {}
+
+
+def record(query: str, seconds: float, rows: int, error: bool = False) -> None:
+    """Record the measurements of a single query, and log it if it was slow.
+
+    Args:
+        query (str): The SQL of the query.
+        seconds (float): How long the query took.
+        rows (int): The number of rows the query returned or affected.
+        error (bool, optional): Whether the query raised an error. Defaults to False.
+    """
+    statement = __normalise(query)
+    statements.setdefault(statement, QueryStats()).record(seconds, rows, error)
+    for table in set(__TABLE_REGEX.findall(query)):
+        tables.setdefault(table, QueryStats()).record(seconds, rows, error)
+    if seconds >= config.slow_query_threshold:
+        __log_slow_query(statement, seconds, rows, error)
+
+
+def summary(limit: int = 10) -> str:
+    """Returns a human readable summary of the slowest statements and tables by total time.
+
+    Args:
+        limit (int, optional): The maximum number of statements and tables to include. Defaults to 10.
+    """
+    lines = ["**Tables** (by total time)"]
+    lines += [__format_stats(name, stats) for name, stats in __top(tables, limit)]
+    lines += ["", "**Statements** (by total time)"]
+    lines += [
+        __format_stats(f"`{statement[:120]}`", stats)
+        for statement, stats in __top(statements, limit)
+    ]
+    return "\n".join(lines)
+
+
+def read_slow_queries(n_lines: int) -> List[str]:
+    """Returns the last `n_lines` lines of the slow query log."""
+    try:
+        with open(config.slow_query_log, "r", encoding="utf-8") as f:
+            return f.readlines()[-n_lines:]
+    except FileNotFoundError:
+        return []
+
+
+class InstrumentedConnection:
+    """Wraps a database connection so that every query run through it is measured. Any attribute not overridden here is passed through to the wrapped connection."""
+
+    __ROW_COUNT_REGEX = re.compile(r"(\d+)$")
+
+    def __init__(self, conn: asyncpg.Connection):
+        self.__conn = conn
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__conn, name)
+
+    async def fetch(self, query: str, *args, **kwargs) -> List[asyncpg.Record]:
+        return await self.__measure(self.__conn.fetch, len, query, *args, **kwargs)
+
+    async def fetchrow(self, query: str, *args, **kwargs) -> Optional[asyncpg.Record]:
+        return await self.__measure(
+            self.__conn.fetchrow, lambda row: int(row is not None), query, *args, **kwargs
+        )
+
+    async def fetchval(self, query: str, *args, **kwargs) -> Any:
+        return await self.__measure(
+            self.__conn.fetchval, lambda value: int(value is not None), query, *args, **kwargs
+        )
+
+    async def execute(self, query: str, *args, **kwargs) -> str:
+        return await self.__measure(self.__conn.execute, self.__row_count, query, *args, **kwargs)
+
+    async def executemany(self, query: str, args, **kwargs) -> None:
+        rows = list(args)
+        await self.__measure(self.__conn.executemany, lambda _: len(rows), query, rows, **kwargs)
+
+    async def __measure(self, method, count_rows, query: str, *args, **kwargs) -> Any:
+        start = time.perf_counter()
+        try:
+            result = await method(query, *args, **kwargs)
+        except Exception:
+            record(query, time.perf_counter() - start, 0, error=True)
+            raise
+        record(query, time.perf_counter() - start, count_rows(result))
+        return result
+
+    @classmethod
+    def __row_count(cls, status: str) -> int:
+        """Extract the number of affected rows from a command status such as "DELETE 3"."""
+        match = cls.__ROW_COUNT_REGEX.search(status or "")
+        return int(match.group(1)) if match else 0
+
+
+def __normalise(query: str) -> str:
+    return __WHITESPACE_REGEX.sub(" ", query).strip()
+
+
+def __top(stats: Dict[str, QueryStats], limit: int):
+    return sorted(stats.items(), key=lambda item: item[1].total_time, reverse=True)[:limit]
+
+
+def __format_stats(name: str, stats: QueryStats) -> str:
+    return (
+        f"{name}: {stats.count} calls, {stats.errors} errors, {stats.rows} rows,"
+        f" mean {stats.mean_time * 1000:.1f}ms, p95 ≤{stats.percentile(0.95):g}ms,"
+        f" max {stats.max_time * 1000:.1f}ms"
+    )
+
+
+def __log_slow_query(statement: str, seconds: float, rows: int, error: bool) -> None:
+    line = (
+        f"{datetime.now()} | {seconds * 1000:.1f}ms | {rows} rows"
+        f"{' | error' if error else ''} | /{current_command.get() or '-'} | {statement}\n"
+    )
+    # write in the background so that the event loop isn't blocked on the file
+    __log_writer.submit(__append_to_log, line)
+
+
+def __append_to_log(line: str) -> None:
+    with open(config.slow_query_log, "a", encoding="utf-8") as f:
+        f.write(line)
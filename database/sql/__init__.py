@@ -1,3 +1,4 @@
 from . import select
 from .delete import delete
-from .insert import insert
+from .insert import insert, insert_many
+from .predicates import AnyOf, Between, Predicate
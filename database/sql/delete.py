@@ -1,5 +1,4 @@
-import config
-
+from .. import pool
 from . import util
 
 
@@ -12,10 +11,9 @@ async def delete(table: str, **conditions):
 
     Args:
         table (str): The name of the table to delete rows from.
-        **conditions:  Keyword arguments specifying constraints on the select statement. For a kwarg A=B, the select statement will only match rows where the column named A has the value B.
+        **conditions:  Keyword arguments specifying constraints on the select statement. For a kwarg A=B, the select statement will only match rows where the column named A has the value B. B may also be a `Predicate` such as `AnyOf` or `Between`.
     """
-    columns, values, placeholders = util.prepare_kwargs(conditions)
-    query = f"DELETE FROM {table}{util.where(columns, placeholders)}"
-    conn = await config.get_connection()
-    async with conn.transaction():
+    shapes, values = util.split_conditions(conditions)
+    query = util.compile_delete(table, shapes)
+    async with pool.acquire() as conn:
         await conn.execute(query, *values)
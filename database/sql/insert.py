@@ -1,7 +1,6 @@
-from typing import Any, Optional
-
-import config
+from typing import Any, Iterable, Optional, Sequence
 
+from .. import pool
 from . import util
 
 
@@ -17,19 +16,36 @@ async def insert(
 
     Args:
         table (str): The name of the table to insert into.
+        on_conflict (str, optional): The conflict target and action to take if the row conflicts with an existing one (eg. "(person, email) DO NOTHING"). By default conflicts raise an error.
         returning (str, optional): The name of the column whose value to return from the inserted row. Commonly this would be the auto-incremented ID but doesn't have to be. By default the function returns None.
         fields: The values to insert into the given table.
 
     Returns:
         Any: The value of the column `returning` in the newly inserted row, or None if no column was specified.
     """
-    keys, values, placeholders = util.prepare_kwargs(fields)
-    query = (
-        f"INSERT INTO {table} ({', '.join(keys)}) VALUES"
-        f" ({', '.join(placeholders)})"
-        f" {'ON CONFLICT ' + on_conflict if on_conflict else ''}"
-        f" {('RETURNING ' + returning) if returning else ''}"
-    )
-    conn = await config.get_connection()
-    async with conn.transaction():
-        return await conn.fetchval(query, *values)
+    query = util.compile_insert(table, tuple(fields), on_conflict, returning)
+    async with pool.acquire() as conn:
+        return await conn.fetchval(query, *fields.values())
+
+
+async def insert_many(
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    on_conflict: Optional[str] = None,
+) -> None:
+    """Insert several rows into the given table in a single batch, atomically.
+
+    For security reasons it is important that the only user input passed into this function is via `rows`.
+
+    Args:
+        table (str): The name of the table to insert into.
+        columns (Sequence[str]): The names of the columns to insert values into.
+        rows (Iterable[Sequence[Any]]): The rows to insert, each being a sequence of values in the same order as `columns`.
+        on_conflict (str, optional): The conflict target and action to take if a row conflicts with an existing one (eg. "(person, email) DO NOTHING"). By default conflicts raise an error.
+    """
+    query = util.compile_insert(table, tuple(columns), on_conflict)
+    rows = list(rows)
+    if rows:
+        async with pool.acquire() as conn:
+            await conn.executemany(query, rows)
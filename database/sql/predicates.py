@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, List, Optional, Sequence
+
+
+class Predicate(ABC):
+    """A condition on a column which can be passed as the value of a kwarg to the functions in `database.sql` in place of a plain value.
+
+    A predicate is described by a template, which depends only on the kind of predicate and which of its parts are in use (never on the values themselves), so that the generated SQL can be cached and reused for every call with the same shape.
+    """
+
+    @property
+    @abstractmethod
+    def template(self) -> str:
+        """A format string for the SQL expression, where `{column}` is the column name and `{0}`, `{1}`, etc. are the placeholders for each of the values."""
+
+    @property
+    @abstractmethod
+    def values(self) -> Sequence[Any]:
+        """The values to bind to the placeholders in the template, in order."""
+
+
+class AnyOf(Predicate):
+    """Matches rows where the column is equal to any one of the given values."""
+
+    def __init__(self, values: Iterable[Any]):
+        self.__values = list(values)
+
+    @property
+    def template(self) -> str:
+        return "{column} = ANY({0})"
+
+    @property
+    def values(self) -> Sequence[Any]:
+        return (self.__values,)
+
+
+class Between(Predicate):
+    """Matches rows where the column lies in the range from `low` (inclusive) to `high` (exclusive unless `inclusive` is set).
+
+    Either bound may be omitted to leave that side of the range open.
+    """
+
+    def __init__(self, low: Optional[Any] = None, high: Optional[Any] = None, inclusive=False):
+        if low is None and high is None:
+            raise ValueError("At least one bound of the range must be specified.")
+        self.__low = low
+        self.__high = high
+        self.__inclusive = inclusive
+
+    @property
+    def template(self) -> str:
+        expressions: List[str] = []
+        if self.__low is not None:
+            expressions.append("{column} >= {%d}" % len(expressions))
+        if self.__high is not None:
+            operator = "<=" if self.__inclusive else "<"
+            expressions.append("{column} %s {%d}" % (operator, len(expressions)))
+        return " AND ".join(expressions)
+
+    @property
+    def values(self) -> Sequence[Any]:
+        return tuple(bound for bound in (self.__low, self.__high) if bound is not None)
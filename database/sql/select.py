@@ -2,45 +2,62 @@ from typing import Any, Coroutine, Iterable, List, Optional, Protocol, TypeVar
 
 import asyncpg
 
-import config
-
+from .. import pool
 from . import util
 
 
-async def many(table: str, columns: Iterable[str] = ("*",), **conditions) -> List[asyncpg.Record]:
+async def many(
+    table: str,
+    columns: Iterable[str] = ("*",),
+    *,
+    _order_by: Optional[str] = None,
+    _limit: Optional[int] = None,
+    **conditions,
+) -> List[asyncpg.Record]:
     """Select all rows in a table matching the kwargs `conditions`.
 
-    For security reasons it is important that the only user input passed into this function is via the values of `**conditions`.
+    For security reasons it is important that the only user input passed into this function is via the values of `**conditions` and `_limit`.
+
+    The options `_order_by` and `_limit` start with an underscore so that they can't clash with the names of columns in `**conditions`.
 
     Args:
         table (str): The name of the table to select from.
         columns (Iterable[str], optional): The names of columns to select. Defaults to all columns.
-        **conditions: Keyword arguments specifying constraints on the select statement. For a kwarg A=B, the select statement will only match rows where the column named A has the value B.
+        _order_by (Optional[str], optional): An expression to order the rows by (eg. "start_time DESC"). Defaults to no particular order.
+        _limit (Optional[int], optional): The maximum number of rows to return. Defaults to no limit.
+        **conditions: Keyword arguments specifying constraints on the select statement. For a kwarg A=B, the select statement will only match rows where the column named A has the value B. B may also be a `Predicate` such as `AnyOf` or `Between`.
 
     Returns:
         List[asyncpg.Record]: A list of the records in the table.
     """
-    conn = await config.get_connection()
-    return await __select(table, columns, conn.fetch, **conditions)
+    async with pool.acquire() as conn:
+        return await __select(table, columns, conn.fetch, _order_by, _limit, **conditions)
 
 
 async def one(
-    table: str, columns: Iterable[str] = ("*",), **conditions
+    table: str,
+    columns: Iterable[str] = ("*",),
+    *,
+    _order_by: Optional[str] = None,
+    **conditions,
 ) -> Optional[asyncpg.Record]:
     """Select a single row from a table matching the kwargs `conditions`.
 
     For security reasons it is important that the only user input passed into this function is via the values of `**conditions`.
 
+    The option `_order_by` starts with an underscore so that it can't clash with the names of columns in `**conditions`.
+
     Args:
         table (str): The name of the table to select from.
         columns (Iterable[str], optional): The names of the columns to select. Defaults to all columns.
-        **conditions: Keyword arguments specifying constraints on the select statement. For a kwarg A=B, the select statement will only match rows where the column named A has the value B.
+        _order_by (Optional[str], optional): An expression to order the rows by, which determines which row is returned when several match. Defaults to no particular order.
+        **conditions: Keyword arguments specifying constraints on the select statement. For a kwarg A=B, the select statement will only match rows where the column named A has the value B. B may also be a `Predicate` such as `AnyOf` or `Between`.
 
     Returns:
         Optional[asyncpg.Record]: The selected row if one was found, or None otherwise.
     """
-    conn = await config.get_connection()
-    return await __select(table, columns, conn.fetchrow, **conditions)
+    async with pool.acquire() as conn:
+        return await __select(table, columns, conn.fetchrow, _order_by, None, **conditions)
 
 
 async def value(table: str, column: str = "*", **conditions) -> Any:
@@ -51,13 +68,13 @@ async def value(table: str, column: str = "*", **conditions) -> Any:
     Args:
         table (str): The name of the table to select from.
         column (str, optional): The names of the columns to select. Defaults to the first column.
-        **conditions: Keyword arguments specifying constraints on the select statement. For a kwarg A=B, the select statement will only match rows where the column named A has the value B.
+        **conditions: Keyword arguments specifying constraints on the select statement. For a kwarg A=B, the select statement will only match rows where the column named A has the value B. B may also be a `Predicate` such as `AnyOf` or `Between`.
 
     Returns:
         Optional[Any]: The value of the selected cell if one was found, or None otherwise.
     """
-    conn = await config.get_connection()
-    return await __select(table, (column,), conn.fetchval, **conditions)
+    async with pool.acquire() as conn:
+        return await __select(table, (column,), conn.fetchval, None, None, **conditions)
 
 
 T = TypeVar("T", covariant=True)
@@ -67,7 +84,16 @@ class Fetcher(Protocol[T]):
     def __call__(self, query: str, *values: Any) -> Coroutine[Any, Any, T]: ...
 
 
-async def __select(table: str, columns: Iterable[str], fetcher: Fetcher[T], **conditions) -> T:
-    filtered_columns, values, placeholders = util.prepare_kwargs(conditions)
-    query = f"SELECT {', '.join(columns)} FROM {table}{util.where(filtered_columns, placeholders)}"
+async def __select(
+    table: str,
+    columns: Iterable[str],
+    fetcher: Fetcher[T],
+    order_by: Optional[str],
+    limit: Optional[int],
+    **conditions,
+) -> T:
+    shapes, values = util.split_conditions(conditions)
+    query = util.compile_select(table, tuple(columns), shapes, order_by, limit is not None)
+    if limit is not None:
+        values.append(limit)
     return await fetcher(query, *values)
@@ -1,36 +1,119 @@
-from typing import Any, Dict, Sequence, Tuple
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from .predicates import Predicate
 
-def where(columns: Sequence[str], placeholders: Sequence[str]) -> str:
-    """Construct a where clause where if the ith and jth elements of `columns` are A and B respectively, and X and Y are the ith and jth elements of `placeholders`, the resulting string would look like " WHERE A = X AND B = Y"
+# A hashable description of a single condition: its column, its SQL template and how many values it binds
+ConditionShape = Tuple[str, str, int]
+
+__EQUALS = "{column} = {0}"
+
+
+def split_conditions(
+    conditions: Dict[str, Any],
+) -> Tuple[Tuple[ConditionShape, ...], List[Any]]:
+    """Separate the shape of the given conditions, which determines the generated SQL, from the values to be bound to its placeholders.
 
     Args:
-        columns (Sequence[str]): A sequence of column names to be included in the where clause.
-        placeholders (Sequence[str]): A sequence of placeholders to place as the values of their corresponding columns.
+        conditions (Dict[str, Any]): A mapping from column names to either a plain value (to test equality against) or a `Predicate`.
 
     Returns:
-        str: A string containing the where clause.
+        Tuple[Tuple[ConditionShape, ...], List[Any]]: A tuple containing the shapes of the conditions in the first index, which can be used as part of a cache key, and a flat list of the values for the placeholders in the second index.
     """
-    expressions = " AND ".join(
-        f"{column} = {placeholder}" for column, placeholder in zip(columns, placeholders)
-    )
-    return "" if not columns else f" WHERE {expressions}"
+    shapes = []
+    values: List[Any] = []
+    for column, condition in conditions.items():
+        if isinstance(condition, Predicate):
+            shapes.append((column, condition.template, len(condition.values)))
+            values.extend(condition.values)
+        else:
+            shapes.append((column, __EQUALS, 1))
+            values.append(condition)
+    return tuple(shapes), values
+
+
+def where(shapes: Sequence[ConditionShape], first_placeholder: int = 1) -> str:
+    """Construct a where clause joining each of the given conditions with AND, numbering the placeholders consecutively. For example, if `shapes` are equality tests on columns A and B, the resulting string would look like " WHERE A = $1 AND B = $2"
+
+    Args:
+        shapes (Sequence[ConditionShape]): The shapes of the conditions to be included in the where clause, as returned by `split_conditions`.
+        first_placeholder (int, optional): The number of the first placeholder. Defaults to 1.
+
+    Returns:
+        str: A string containing the where clause, or an empty string if there are no conditions.
+    """
+    expressions = []
+    index = first_placeholder
+    for column, template, arity in shapes:
+        placeholders = [f"${i}" for i in range(index, index + arity)]
+        expressions.append(template.format(*placeholders, column=column))
+        index += arity
+    return f" WHERE {' AND '.join(expressions)}" if expressions else ""
+
 
+@lru_cache(maxsize=512)
+def compile_select(
+    table: str,
+    columns: Tuple[str, ...],
+    shapes: Tuple[ConditionShape, ...],
+    order_by: Optional[str] = None,
+    limit: bool = False,
+) -> str:
+    """Generate (or fetch from the cache) the SQL for a select statement.
+
+    Args:
+        table (str): The name of the table to select from.
+        columns (Tuple[str, ...]): The names of the columns to select.
+        shapes (Tuple[ConditionShape, ...]): The shapes of the conditions, as returned by `split_conditions`.
+        order_by (Optional[str], optional): An expression to order the results by (eg. "name DESC"). Defaults to no ordering.
+        limit (bool, optional): Whether to add a LIMIT clause, whose value will be the placeholder after the last condition. Defaults to False.
+
+    Returns:
+        str: The SQL for the select statement.
+    """
+    query = f"SELECT {', '.join(columns)} FROM {table}{where(shapes)}"
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    if limit:
+        query += f" LIMIT ${sum(arity for _, _, arity in shapes) + 1}"
+    return query
 
-def prepare_kwargs(kwargs: Dict[str, Any]) -> Tuple[Sequence[str], Sequence[Any], Sequence[str]]:
-    """Create three sequences from the provided kwargs.
 
-    The first sequence is the keys of the kwargs. The second sequence is the values. The third sequence is the placeholders for the SQL prepared statements (e.g. $1, $2, etc).
+@lru_cache(maxsize=512)
+def compile_insert(
+    table: str,
+    keys: Tuple[str, ...],
+    on_conflict: Optional[str] = None,
+    returning: Optional[str] = None,
+) -> str:
+    """Generate (or fetch from the cache) the SQL for an insert statement of a single row.
 
     Args:
-        kwargs (Dict[str, Any]): A dictionary of keyword arguments.
+        table (str): The name of the table to insert into.
+        keys (Tuple[str, ...]): The names of the columns to insert values into.
+        on_conflict (Optional[str], optional): The conflict target and action (eg. "(a, b) DO NOTHING"). Defaults to None.
+        returning (Optional[str], optional): The column to return from the inserted row. Defaults to None.
 
     Returns:
-        Tuple[Sequence[str], Sequence[Any], Sequence[str]]: A tuple containing a sequence of the keys from the kwargs in the first index, a sequence of the values from the kwargs in the second index, and a sequence of the placeholders for the SQL prepared statements in the third index.
+        str: The SQL for the insert statement.
     """
-    keys, values, placeholders = (
-        zip(*[(key, kwargs[key], f"${index}") for index, key in enumerate(kwargs, 1)])
-        if kwargs
-        else ((), (), ())
+    placeholders = ", ".join(f"${i}" for i in range(1, len(keys) + 1))
+    return (
+        f"INSERT INTO {table} ({', '.join(keys)}) VALUES ({placeholders})"
+        f" {'ON CONFLICT ' + on_conflict if on_conflict else ''}"
+        f" {('RETURNING ' + returning) if returning else ''}"
     )
-    return keys, values, placeholders
+
+
+@lru_cache(maxsize=512)
+def compile_delete(table: str, shapes: Tuple[ConditionShape, ...]) -> str:
+    """Generate (or fetch from the cache) the SQL for a delete statement.
+
+    Args:
+        table (str): The name of the table to delete from.
+        shapes (Tuple[ConditionShape, ...]): The shapes of the conditions, as returned by `split_conditions`.
+
+    Returns:
+        str: The SQL for the delete statement.
+    """
+    return f"DELETE FROM {table}{where(shapes)}"
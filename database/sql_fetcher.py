@@ -1,22 +1,53 @@
+"""
+This module loads the SQL code stored in `.sql` files.
+
+Queries are only looked for in the folders matched by `QUERY_FOLDERS`, and each
+file is read from disk the first time it is fetched and kept in memory from
+then on. Call `await validate()` at startup to read and prepare every query in
+advance, so that a broken query fails loudly then rather than when first used.
+"""
+
+import glob
 import os
-from functools import cache
+from typing import Dict, List, Sequence, Tuple
+
+from . import pool
+
+# Glob patterns of the folders which contain queries, relative to the root of the project
+QUERY_FOLDERS: Sequence[str] = (
+    os.path.join("database", "*", "queries"),
+    os.path.join("modules", "*", "queries"),
+)
 
+__cache: Dict[Tuple[str, ...], str] = {}
 
-@cache
-def fetch(*paths: str):
+
+def fetch(*paths: str) -> str:
     """
-    Fetches the SQL code in the file `file_name` located in the given directory.
+    Fetches the SQL code in the file located at the given path.
 
-    :param *paths: Path components, as would be passed to os.path.join(). Relative to `sql_folder` passed to the constructor.
+    :param *paths: Path components, as would be passed to os.path.join(). Relative to the root of the project.
     """
-    path = os.path.join(".", *paths)
-    return open(path, "r").read()
+    if paths not in __cache:
+        with open(os.path.join(".", *paths), "r", encoding="utf-8") as file:
+            __cache[paths] = file.read()
+    return __cache[paths]
+
+
+def manifest() -> List[Tuple[str, ...]]:
+    """Returns the path components of every `.sql` file in the folders listed in `QUERY_FOLDERS`, without reading any of them."""
+    return sorted(
+        tuple(os.path.normpath(path).split(os.sep))
+        for folder in QUERY_FOLDERS
+        for path in glob.glob(os.path.join(folder, "*.sql"))
+    )
 
 
-for path in [
-    os.path.join(directory, file_name)
-    for directory, _, file_names in os.walk(".")
-    for file_name in file_names
-    if file_name[-4:] == ".sql"
-]:
-    fetch(path)  # load all sql files on initialisation
+async def validate() -> None:
+    """Load every query in the manifest into memory and prepare it against the database, which raises an error if any of them is invalid (for example, if it refers to a column that doesn't exist)."""
+    async with pool.acquire() as conn:
+        for paths in manifest():
+            try:
+                await conn.prepare(fetch(*paths))
+            except Exception as e:
+                raise ValueError(f"Invalid query in {os.path.join(*paths)}: {e}") from e
@@ -0,0 +1,45 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class TtlDirectory(ABC):
+    """An in-memory index of some data from the database.
+
+    The data is loaded from the database on first use and reloaded whenever it is older than `ttl` seconds or after `invalidate()` is called, so lookups normally never touch the database. Subclasses load the data and build their indices in `_load()`, and call `_ensure_fresh()` before each lookup.
+    """
+
+    def __init__(self, ttl: float):
+        self.__ttl = ttl
+        self.__loaded_at: Optional[float] = None
+        self.__lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the data must be reloaded from the database before it is next used."""
+        return self.__loaded_at is None or time.monotonic() - self.__loaded_at > self.__ttl
+
+    def invalidate(self) -> None:
+        """Mark the data as stale so that it is reloaded from the database on next use. Call this after modifying the tables it is loaded from."""
+        self.__loaded_at = None
+
+    async def refresh(self) -> None:
+        """Reload the data from the database and rebuild the indices."""
+        async with self.__lock:
+            await self.__reload()
+
+    async def _ensure_fresh(self) -> None:
+        if self.is_stale:
+            async with self.__lock:
+                # another task may have reloaded the data while this one waited for the lock
+                if self.is_stale:
+                    await self.__reload()
+
+    async def __reload(self) -> None:
+        await self._load()
+        self.__loaded_at = time.monotonic()
+
+    @abstractmethod
+    async def _load(self) -> None:
+        """Load the data from the database and rebuild the indices."""
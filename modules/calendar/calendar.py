@@ -1,9 +1,9 @@
-from typing import Dict, Iterable, Optional
+from typing import Dict, List, Optional
 
 import nextcord
 from nextcord.ext import commands
 
-from database.group import Group
+from database.group_directory import directory
 from modules.error.friendly_error import FriendlyError
 from utils.utils import one
 
@@ -11,10 +11,14 @@ from utils.utils import one
 class Calendar:
     """Calendar object to store information about a Google Calendar"""
 
-    def __init__(self, id: str, name: str):
-        """Create a calendar object from a calendar id and name"""
+    # the sets of calendars which can be searched at once, with their descriptions
+    SCOPES = {"mine": "All my classes", "all": "All classes"}
+
+    def __init__(self, id: str, name: str, group_id: Optional[int] = None):
+        """Create a calendar object from a calendar id and name, and the id of the group which owns it if known"""
         self.__id = id
         self.__name = name
+        self.__group_id = group_id
 
     @property
     def id(self) -> str:
@@ -26,6 +30,11 @@ class Calendar:
         """The name of the calendar"""
         return self.__name
 
+    @property
+    def group_id(self) -> Optional[int]:
+        """The ID of the group which owns the calendar, if known"""
+        return self.__group_id
+
     def add_url(self) -> str:
         """The url to add the calendar to Google Calendar"""
         return (
@@ -54,7 +63,6 @@ class Calendar:
     async def get_calendar(
         cls,
         interaction: nextcord.Interaction[commands.Bot],
-        groups: Optional[Iterable[Group]] = None,
         group_id: Optional[int] = None,
         ephemeral: bool = False,
     ) -> "Calendar":
@@ -62,21 +70,26 @@ class Calendar:
 
         Args:
             interaction (nextcord.Interaction): The interaction object to use to report errors.
-            groups (Optional[Iterable[Group]], optional): The groups who might own the calendar. Defaults to all of them.
             group_id (Optional[int], optional): The group id which owns the calendar we seek. Defaults to the user's group, if he has only one.
             ephemeral: Whether to use ephemeral messages when sending errors. Defaults to False.
 
         Returns:
             The calendar object.
         """
-        groups = groups or await Group.get_groups()
         if group_id:
             # get the group specified by the user given the group id
-            group = one(group for group in groups if group.id == group_id)
+            group = await directory.get_group(group_id)
+            if group is None:
+                raise FriendlyError(
+                    "Could not find the class you specified.",
+                    interaction,
+                    interaction.user,
+                    ephemeral=ephemeral,
+                )
         else:
             # get the group from the user's role
             member_groups = (
-                [group for group in groups if group.role in interaction.user.roles]
+                await directory.groups_of(interaction.user)
                 if isinstance(interaction.user, nextcord.Member)
                 else []
             )
@@ -99,4 +112,41 @@ class Calendar:
             # only one group found
             group = one(member_groups)
         # return calendar for the group
-        return cls(id=group.calendar, name=group.name)
+        return cls(id=group.calendar, name=group.name, group_id=group.id)
+
+    @classmethod
+    async def get_calendars(
+        cls,
+        interaction: nextcord.Interaction[commands.Bot],
+        scope: str,
+        ephemeral: bool = False,
+    ) -> List["Calendar"]:
+        """Returns the Calendars of the groups in a scope
+
+        Args:
+            interaction (nextcord.Interaction): The interaction object to use to report errors.
+            scope (str): "mine" for the groups of the user's class roles, or "all" for all the groups.
+            ephemeral: Whether to use ephemeral messages when sending errors. Defaults to False.
+
+        Returns:
+            The calendar objects, in no particular order.
+        """
+        if scope == "all":
+            groups = list(await directory.groups())
+        else:
+            # get the groups from the user's roles
+            groups = (
+                await directory.groups_of(interaction.user)
+                if isinstance(interaction.user, nextcord.Member)
+                else []
+            )
+            # no group roles found
+            if not groups:
+                raise FriendlyError(
+                    "Could not find your class role.",
+                    interaction,
+                    interaction.user,
+                    ephemeral=ephemeral,
+                )
+        # return calendars for the groups
+        return [cls(id=group.calendar, name=group.name, group_id=group.id) for group in groups]
@@ -1,6 +1,7 @@
-from typing import Dict
+from typing import Dict, Mapping, Tuple
 
 from database.campus import Campus
+from database.group_directory import directory
 from modules.calendar.calendar import Calendar
 
 from .calendar_service import CalendarService
@@ -10,16 +11,39 @@ class CalendarCreator:
     def __init__(self, service: CalendarService):
         self.__service = service
 
-    async def create_group_calendars(self, year: int) -> Dict[Campus, Calendar]:
+    async def create_group_calendars(
+        self, year: int
+    ) -> Tuple[Dict[Campus, Calendar], Dict[Campus, Exception]]:
         """Create a calendar for each campus.
 
+        The calendars of all the campuses are created together in batch requests. If the calendar of a campus can't be created, the other campuses' calendars are still created and the failure is returned along with them.
+
         Args:
             year (int): The year to create the calendars for.
 
         Returns:
-            Dict[int, Calendar]: A dict mapping from campus ID to the newly created calendar objects.
+            Tuple[Dict[Campus, Calendar], Dict[Campus, Exception]]: A dict mapping from each campus whose calendar was created to the newly created calendar object, and a dict mapping from each campus whose calendar couldn't be created to the reason why.
         """
-        return {
-            campus: self.__service.create_calendar(f"JCT CompSci {campus.name} {year}")
-            for campus in await Campus.get_campuses()
-        }
+        campuses = {str(campus.id): campus for campus in await directory.campuses()}
+        results = await self.__service.create_calendars(
+            {key: f"JCT CompSci {campus.name} {year}" for key, campus in campuses.items()}
+        )
+        calendars: Dict[Campus, Calendar] = {}
+        failures: Dict[Campus, Exception] = {}
+        for key, result in results.items():
+            if isinstance(result, Calendar):
+                calendars[campuses[key]] = result
+            else:
+                failures[campuses[key]] = result
+        return calendars, failures
+
+
+class CalendarCreationError(Exception):
+    """Raised when the calendars of some campuses couldn't be created"""
+
+    def __init__(self, year: int, failures: Mapping[Campus, Exception]):
+        super().__init__(
+            f"Failed to create the {year} calendars of these campuses: "
+            + "; ".join(f"{campus.name}: {error}" for campus, error in failures.items())
+        )
+        self.failures = failures
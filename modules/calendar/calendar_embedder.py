@@ -1,23 +1,39 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, Generator, Optional, Sequence
+from collections import OrderedDict
+from typing import Dict, Generator, Mapping, Optional, Sequence, Tuple
+from weakref import WeakKeyDictionary
 
 import nextcord
-from more_itertools import peekable
 from nextcord.ext import commands
 
 from modules.error.friendly_error import FriendlyError
 from utils import utils
-from utils.embedder import MAX_EMBED_DESCRIPTION_LENGTH, build_embed
-from utils.reactions import wait_for_reaction
+from utils.embedder import build_embed
 from utils.utils import one
 
+from . import components
 from .calendar import Calendar
+from .components import EventChoice, PageRequest
 from .event import Event
+from .event_pages import EventPages
 
 
 class CalendarEmbedder:
+    # the maximum number of layouts of event lists to keep
+    __MAX_CACHED_LAYOUTS = 64
+
+    # the names of the scopes of calendars events can be shown from, for the titles of pages
+    __SCOPE_NAMES = {"mine": "Your Classes", "all": "All Classes"}
+
+    # the titles of pages of events by the period they are from ("" for all upcoming events)
+    __PAGE_TITLES = {
+        "": "📅 Upcoming Events for {}",
+        "today": "📅 Today's Events for {}",
+        "week": "📅 Events in the Next 7 Days for {}",
+    }
+
     def __init__(self, bot: commands.Bot, timezone: str):
         self.bot = bot
         self.timezone = timezone
@@ -34,61 +50,68 @@ class CalendarEmbedder:
             "8️⃣",
             "9️⃣",
         )
+        # formatted events, kept for as long as the events themselves are
+        self.__formatted_events: WeakKeyDictionary[Event, str] = WeakKeyDictionary()
+        # recent layouts of event lists and the events they were laid out from
+        self.__layouts: OrderedDict[
+            Tuple[str, str, int, Tuple[str, ...]], Tuple[Tuple[Event, ...], EventPages]
+        ] = OrderedDict()
 
-    async def embed_event_pages(
+    def embed_event_page(
         self,
-        interaction: nextcord.Interaction[commands.Bot],
-        events_list: Sequence[Event],
+        events: Sequence[Event],
         query: str,
+        calendar: Optional[Calendar],
+        user_id: int,
         results_per_page: int,
-        calendar: Calendar,
-    ):
-        """Embed page of events and wait for reactions to continue to new pages"""
-        # peekable generator for events
-        events = peekable(events_list)
-        # set start index
-        page_num = 1
-        # message reference for editing
-        message: Optional[nextcord.InteractionMessage] = None
-        while True:
-            try:
-                # create embed
-                embed = self.embed_event_list(
-                    title=f"📅 Upcoming Events for {calendar.name}",
-                    events=events,
-                    calendar=calendar,
-                    description=f'Showing results for "{query}"' if query else "",
-                    page_num=page_num,
-                    max_results=results_per_page,
-                )
-                message = await interaction.edit_original_message(embed=embed)
-                # set emoji and page based on whether there are more events
-                if events:
-                    next_emoji = "⏬"
-                    page_num += 1
-                else:
-                    # if only 1 page, exit the loop
-                    if page_num == 1:
-                        break
-                    # add reaction for starting over from page 1
-                    next_emoji = "⤴️"
-                    page_num = 1
-                    # reset the peekable generator
-                    events = peekable(events_list)
-                # wait for author to respond to go to next page
-                await wait_for_reaction(
-                    bot=self.bot,
-                    message=message,
-                    emoji_list=[next_emoji],
-                    allowed_users=(
-                        [interaction.user]
-                        if isinstance(interaction.user, nextcord.Member)
-                        else None
-                    ),
-                )
-            # time window exceeded
-            except FriendlyError:
-                break
+        page_num: int = 1,
+        period: str = "",
+        scope: str = "",
+        sources: Optional[Mapping[Event, Calendar]] = None,
+    ) -> Tuple[nextcord.Embed, nextcord.ui.View]:
+        """Embed a page of upcoming events, with buttons for the user to move between the pages.
+
+        Args:
+            events (Sequence[Event]): The upcoming events which match the query, in chronological order.
+            query (str): The query the events were searched for with, shown at the top of the page.
+            calendar (Optional[Calendar]): The calendar the events are from, or None if they are from the calendars of a scope.
+            user_id (int): The id of the user who may turn the pages.
+            results_per_page (int): The maximum number of events to show on each page.
+            page_num (int, optional): The number of the page to show (the last page if there are fewer). Defaults to 1.
+            period (str, optional): The period the events are from (see `CalendarService.PERIODS`), or "" if they are all the upcoming events which match the query.
+            scope (str, optional): The calendars the events are from (see `Calendar.SCOPES`), or "" if they are from `calendar`.
+            sources (Optional[Mapping[Event, Calendar]], optional): The calendar each event is from, to show alongside the events from a scope.
+
+        Returns:
+            The embed of the page and the view holding its buttons.
+        """
+        pages = self.layout_events(
+            events,
+            calendar,
+            description=f'Showing results for "{query}"' if query else "",
+            max_results=results_per_page,
+            sources=sources,
+        )
+        page_num = max(min(page_num, pages.page_count), 1)
+        name = calendar.name if calendar else self.__SCOPE_NAMES[scope]
+        embed = self.embed_event_list(
+            title=self.__PAGE_TITLES[period].format(name), pages=pages, page_num=page_num
+        )
+        # the group id of the calendar, or 0 if the calendars are found from the scope
+        group_id = calendar.group_id if calendar else 0
+        # no buttons if the events fit on one page or the calendar can't be found again from a click
+        if group_id is None or pages.page_count == 1:
+            return embed, components.view()
+        previous_page = PageRequest(
+            group_id, user_id, page_num - 1, results_per_page, period, scope, query
+        )
+        next_page = PageRequest(
+            group_id, user_id, page_num + 1, results_per_page, period, scope, query
+        )
+        return embed, components.view(
+            previous_page.button("Previous", "◀️", disabled=page_num == 1),
+            next_page.button("Next", "▶️", disabled=page_num == pages.page_count),
+        )
 
     async def get_event_choice(
         self,
@@ -97,11 +120,21 @@ class CalendarEmbedder:
         calendar: Calendar,
         query: str,
         action: str,
-    ) -> Event:
+        token: str = "",
+    ) -> Optional[Event]:
         """
         If there are no events, throws an error.
-        If there are multiple events, embed list of events and wait for reaction to select an event.
+        If there are multiple events, embed list of events with a menu to select an event and return None.
+        The calendar cog applies the action once an event is selected.
         If there is one event, return it.
+
+        Args:
+            interaction (nextcord.Interaction): The interaction to respond to.
+            events_list (Sequence[Event]): The events to choose from.
+            calendar (Calendar): The calendar the events are from.
+            query (str): The query the events were searched for with.
+            action (str): The action to apply to the chosen event ("update" or "delete").
+            token (str, optional): Identifies the details of the action which are kept by the cog, if any.
         """
         # no events found
         if not events_list:
@@ -111,94 +144,103 @@ class CalendarEmbedder:
         # if only 1 event found, get the event at index 0
         if len(events_list) == 1:
             return one(events_list)
-        # create a peekable iterable of events
-        events = peekable(events_list)
+        if calendar.group_id is None or interaction.user is None:
+            raise ValueError("Events can only be chosen from a group's calendar by a user.")
         # multiple events found
-        embed = self.embed_event_list(
-            title=f"⚠ Multiple events were found.",
-            events=events,
-            calendar=calendar,
+        pages = self.layout_events(
+            events_list,
+            calendar,
             description=(
                 f"Please specify which event you would like to {action}."
                 f'\n\nShowing results for "{query}"'
             ),
-            colour=nextcord.Colour.gold(),
             enumeration=self.number_emoji,
         )
-        await interaction.send(embed=embed)
-        message = await interaction.original_message()
+        embed = self.embed_event_list(
+            title=f"⚠ Multiple events were found.",
+            pages=pages,
+            colour=nextcord.Colour.gold(),
+        )
         # get the number of events that were displayed
-        next_event = events.peek(None)
-        num_events = events_list.index(next_event) if next_event else len(events_list)
-        # ask user to pick an event with emojis
-        selection_index = await wait_for_reaction(
-            bot=self.bot,
-            message=message,
-            emoji_list=self.number_emoji[:num_events],
-            allowed_users=(
-                [interaction.user] if isinstance(interaction.user, nextcord.Member) else None
-            ),
+        _, num_events = pages.bounds(1)
+        # ask user to pick an event from a menu
+        options = [
+            nextcord.SelectOption(
+                label=utils.trim(event.title or "(No title)", 100),
+                value=event.id,
+                description=utils.trim(event.relative_date_range_str(), 100),
+                emoji=emoji,
+            )
+            for event, emoji in zip(events_list[:num_events], self.number_emoji)
+        ]
+        choice = EventChoice(action, calendar.group_id, interaction.user.id, token)
+        await interaction.send(embed=embed, view=components.view(choice.select(options)))
+        return None
+
+    def layout_events(
+        self,
+        events: Sequence[Event],
+        calendar: Optional[Calendar],
+        description: str = "",
+        max_results: int = 10,
+        enumeration: Sequence[str] = (),
+        sources: Optional[Mapping[Event, Calendar]] = None,
+    ) -> EventPages:
+        """Lay out event summaries, links, and dates for each event in the given list into pages.
+        The layout is reused as long as the same events are laid out the same way.
+
+        Args:
+            events (Sequence[Event]): The events to display.
+            calendar (Optional[Calendar]): The calendar the events are from, or None if they are from several calendars (whose links aren't shown).
+            description (str, optional): The description to embed below the title.
+            max_results (int, optional): The maximum number of events to display on each page.
+            enumeration (Sequence[str], optional): Emojis to display alongside the events of each page (for choices).
+            sources (Optional[Mapping[Event, Calendar]], optional): The calendar each event is from, to display alongside it.
+        """
+        key = (calendar.id if calendar else "", description, max_results, tuple(enumeration))
+        events = tuple(events)
+        cached = self.__layouts.get(key)
+        if cached is not None and cached[0] == events:
+            self.__layouts.move_to_end(key)
+            return cached[1]
+        pages = EventPages(
+            [
+                self.__format_event(event) + (f"🗓️ {sources[event].name}\n" if sources else "")
+                for event in events
+            ],
+            header=description,
+            links=self.__calendar_links(calendar) if calendar else "",
+            max_results=max_results,
+            enumeration=enumeration,
         )
-        # get the event selected by the user
-        return events_list[selection_index]
+        self.__layouts[key] = (events, pages)
+        self.__layouts.move_to_end(key)
+        if len(self.__layouts) > self.__MAX_CACHED_LAYOUTS:
+            self.__layouts.popitem(last=False)
+        return pages
 
     def embed_event_list(
         self,
         title: str,
-        events: peekable[Event],
-        calendar: Calendar,
-        description: str = "",
+        pages: EventPages,
         colour: nextcord.Colour = nextcord.Colour.blue(),
-        enumeration: Sequence[str] = (),
-        page_num: Optional[int] = None,
-        max_results: int = 10,
+        page_num: int = 1,
     ) -> nextcord.Embed:
-        """Generates an embed with event summaries, links, and dates for each event in the given list
-
-        Arguments:
+        """Generates an embed with a page of events laid out by `layout_events`
 
-        :param title: :class:`str` the title to display at the top
-        :param events: :class:`peekable[Event]` the events to display
-        :param calendar: :class:`Calendar` the calendar the events are from
-        :param description: :class:`Optional[str]` the description to embed below the title
-        :param colour: :class:`Optional[nextcord.Colour]` the embed colour
-        :param enumeration: :class:`Optional[Iterable[str]]` list of emojis to display alongside events (for reaction choices)
-        :param page_num: :class:`Optional[int]` page number to display in the footer
-        :param max_results: :class:`int` maximum results to display in the list
+        Args:
+            title (str): The title to display at the top.
+            pages (EventPages): The layout of the events.
+            colour (nextcord.Colour, optional): The embed colour.
+            page_num (int, optional): The number of the page to display. Defaults to 1.
         """
-        # get calendar links
-        links = self.__calendar_links(calendar)
-        # limit max results to the number of emojis in the enumeration
-        max_results = min(max_results, len(enumeration)) if enumeration else max_results
-        # set initial description if available
-        description = f"{description}\n" if description else ""
-        # check if events peekable is empty
-        description += "No events found.\n" if not events else ""
-        # create iterator for enumeration
-        enumerator = iter(enumeration)
-        # add events to embed
-        for i in range(max_results):
-            event = events.peek(None)
-            # if event is None, no more events
-            if not event:
-                break
-            # get event details and add enumeration emoji if available
-            event_details = f"\n{next(enumerator, '')} {self.__format_event(event)}"
-            # make sure embed doesn't exceed max length (unless it won't fit on its own page)
-            if len(description + event_details + links) > MAX_EMBED_DESCRIPTION_LENGTH and i > 0:
-                break
-            # add event to embed
-            description += event_details
-            # consume event
-            next(events)
-        # add links for viewing and editing on Google Calendar
-        description += links
-        # hide page number if page one and no more results
-        if page_num == 1 and not events:
-            page_num = None
-        # add page number and timezone info
-        footer = self.__footer_text(page_num=page_num)
-        return build_embed(title=title, description=description, footer=footer, colour=colour)
+        # add page number (if there are several pages) and timezone info
+        footer = self.__footer_text(
+            page_num=page_num if pages.page_count > 1 else None, page_count=pages.page_count
+        )
+        return build_embed(
+            title=title, description=pages.render(page_num), footer=footer, colour=colour
+        )
 
     def embed_links(
         self,
@@ -243,13 +285,15 @@ class CalendarEmbedder:
 
     def __format_event(self, event: Event) -> str:
         """Format event as a markdown linked summary and the dates below"""
-        info = f"**[{event.title}]({event.link})**\n"
-        info += f"{event.relative_date_range_str()}\n"
-        if event.description:
-            info += f"{self.__format_paragraph(event.description)}\n"
-        if event.location:
-            info += f":round_pushpin: {self.__format_paragraph(event.location)}\n"
-        return info
+        if event not in self.__formatted_events:
+            info = f"**[{event.title}]({event.link})**\n"
+            info += f"{event.relative_date_range_str()}\n"
+            if event.description:
+                info += f"{self.__format_paragraph(event.description)}\n"
+            if event.location:
+                info += f":round_pushpin: {self.__format_paragraph(event.location)}\n"
+            self.__formatted_events[event] = info
+        return self.__formatted_events[event]
 
     def __calendar_links(self, calendar: Calendar) -> str:
         """Return text with links to view or edit the Google Calendar"""
@@ -258,9 +302,9 @@ class CalendarEmbedder:
             f" with Google]({calendar.add_url()}) (use `/calendar grant` for access)"
         )
 
-    def __footer_text(self, page_num: Optional[int] = None) -> str:
+    def __footer_text(self, page_num: Optional[int] = None, page_count: int = 1) -> str:
         """Return text about timezone to display at end of embeds with dates"""
-        page_num_text = f"Page {page_num} | " if page_num is not None else ""
+        page_num_text = f"Page {page_num} of {page_count} | " if page_num is not None else ""
         timezone_text = f"Times are shown for {self.timezone}"
         return page_num_text + timezone_text
 
@@ -1,26 +1,37 @@
-from datetime import datetime
-from typing import Any, Dict, Optional, Sequence
-
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from thefuzz import fuzz
+import asyncio
+import heapq
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from zoneinfo import ZoneInfo
 
 import config
-from utils.utils import parse_date
+from utils import google_clients
+from utils.utils import parse_api_datetime, parse_date
 
 from .calendar import Calendar
 from .event import Event
-from .md_html_converter import html_to_md, md_to_html
+from .event_filter import match_events
+from .event_store import EventStore
+from .md_html_converter import md_to_html
 
 
 class CalendarService:
+    """Reads and writes Google Calendars.
+
+    Requests to the Calendar API are run by the shared `GoogleExecutor`, so awaiting any of the methods below doesn't block the event loop. The events of each calendar are kept in an `EventStore`, so reading them normally doesn't make a request at all.
+    """
+
+    # the number of days in each period which events can be fetched for
+    PERIODS = {"today": 1, "week": 7}
+
+    # the access control rule which lets anyone see a calendar's events
+    __PUBLIC_RULE = {"scope": {"type": "default"}, "role": "reader"}
+
     def __init__(self, timezone: str):
-        SCOPES = ["https://www.googleapis.com/auth/calendar"]
-        self.creds = service_account.Credentials.from_service_account_info(
-            config.google_config, scopes=SCOPES
-        )
-        self.service = build("calendar", "v3", credentials=self.creds)
+        self.service = google_clients.client("calendar", "v3")
+        self.executor = google_clients.executor()
         self.timezone = timezone
+        self.__stores: Dict[str, EventStore] = {}
 
     def get_links(self, calendar: Calendar) -> Dict[str, str]:
         """Get a dict of links for adding and viewing a given Google Calendar"""
@@ -30,44 +41,59 @@ class CalendarService:
             "iCal Format": calendar.ical_url(),
         }
 
-    def fetch_upcoming(
+    async def fetch_upcoming(
         self,
         calendar_id: str,
         query: str = "",
-        page_token: Optional[str] = None,
         max_results: int = 100,
-    ) -> Sequence[Event]:
+    ) -> List[Event]:
         """Fetch upcoming events from the calendar"""
-        # get the current date and time ('Z' indicates UTC time)
-        now = datetime.utcnow().isoformat() + "Z"
-        # fetch results from the calendar API
-        events_result = (
-            self.service.events()
-            .list(
-                calendarId=calendar_id,
-                timeMin=now,
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy="startTime",
-                pageToken=page_token,
-            )
-            .execute()
-        )
-        # return list of events
-        events = events_result.get("items", [])
+        # get the events which haven't ended yet from the store, in chronological order
+        events = (await self.__store(calendar_id).timeline()).upcoming(self.__now())
         # filter by search term
-        clean_query = query.lower().replace(" ", "")
-        # convert dicts to Event objects
-        converted_events = tuple(
-            self.__dict_to_event(dict_)
-            for dict_ in events
-            if clean_query in dict_["summary"].lower().replace(" ", "")
-            or fuzz.token_set_ratio(query, dict_["summary"]) > 75
-        )
-        # return events and the next page's token
-        return converted_events
+        return [event for event, _ in match_events(query, events)][:max_results]
+
+    async def fetch_upcoming_merged(
+        self, calendar_ids: Sequence[str], query: str = ""
+    ) -> List[Tuple[str, Event]]:
+        """Get the upcoming events from several calendars which match the query, in chronological order.
+        The calendars are read concurrently, so this takes about as long as reading the slowest one.
 
-    def add_event(
+        Args:
+            calendar_ids (Sequence[str]): The ids of the calendars.
+            query (str, optional): The query to search for within event titles.
+
+        Returns:
+            List[Tuple[str, Event]]: The events, each with the id of the calendar it is from.
+        """
+
+        async def fetch(calendar_id: str) -> List[Tuple[str, Event]]:
+            return [(calendar_id, event) for event in await self.fetch_upcoming(calendar_id, query)]
+
+        # merge the chronological lists of events of each calendar
+        events = await asyncio.gather(*(fetch(calendar_id) for calendar_id in calendar_ids))
+        return list(heapq.merge(*events, key=lambda item: item[1].start))
+
+    async def fetch_next(self, calendar_id: str) -> Optional[Event]:
+        """Get the next event from the calendar which hasn't started yet, if any"""
+        return (await self.__store(calendar_id).timeline()).next(self.__now())
+
+    async def fetch_period(self, calendar_id: str, period: str) -> List[Event]:
+        """Get the events from the calendar which take place during a period, in chronological order
+
+        Args:
+            calendar_id (str): The id of the calendar.
+            period (str): One of the keys of `PERIODS`: "today", or "week" for the 7 days starting today.
+        """
+        today = datetime.combine(self.__now().date(), time())
+        end = today + timedelta(days=self.PERIODS[period])
+        return (await self.__store(calendar_id).timeline()).between(today, end)
+
+    async def get_event(self, calendar_id: str, event_id: str) -> Optional[Event]:
+        """Get an event from the calendar given its id, or None if the calendar has no such event"""
+        return await self.__store(calendar_id).get(event_id)
+
+    async def add_event(
         self,
         calendar_id: str,
         summary: str,
@@ -125,18 +151,26 @@ class CalendarService:
             ),
         }
         # Add event to the calendar
-        event = self.service.events().insert(calendarId=calendar_id, body=event_details).execute()
-        return self.__dict_to_event(event)
+        event = self.__dict_to_event(
+            await self.executor.execute(
+                self.service.events().insert(calendarId=calendar_id, body=event_details)
+            )
+        )
+        self.__store(calendar_id).put(event)
+        return event
 
-    def delete_event(self, calendar_id: str, event: Event) -> None:
+    async def delete_event(self, calendar_id: str, event: Event) -> None:
         """Delete an event from a calendar given the calendar id and event object"""
         # delete event
-        response = self.service.events().delete(calendarId=calendar_id, eventId=event.id).execute()
+        response = await self.executor.execute(
+            self.service.events().delete(calendarId=calendar_id, eventId=event.id)
+        )
         # response should be empty if successful
         if response != "":
             raise ConnectionError("Couldn't delete event.", response)
+        self.__store(calendar_id).remove(event.id)
 
-    def update_event(
+    async def update_event(
         self,
         calendar_id: str,
         event: Event,
@@ -188,28 +222,75 @@ class CalendarService:
             ),
         }
         # update the event
-        updated_event = (
-            self.service.events()
-            .update(calendarId=calendar_id, eventId=event.id, body=event_details)
-            .execute()
+        updated_event = self.__dict_to_event(
+            await self.executor.execute(
+                self.service.events().update(
+                    calendarId=calendar_id, eventId=event.id, body=event_details
+                )
+            )
         )
-        return self.__dict_to_event(updated_event)
+        self.__store(calendar_id).put(updated_event)
+        return updated_event
 
-    def create_calendar(self, summary: str) -> Calendar:
+    async def create_calendar(self, summary: str) -> Calendar:
         """Creates a new public calendar on the service account given the name
         Returns the calendar object"""
         # create the calendar
         calendar = {"summary": summary, "timeZone": self.timezone}
         created_calendar = Calendar.from_dict(
-            self.service.calendars().insert(body=calendar).execute()
+            await self.executor.execute(self.service.calendars().insert(body=calendar))
         )
         # make calendar public
-        rule = {"scope": {"type": "default"}, "role": "reader"}
-        self.service.acl().insert(calendarId=created_calendar.id, body=rule).execute()
+        await self.executor.execute(
+            self.service.acl().insert(calendarId=created_calendar.id, body=self.__PUBLIC_RULE)
+        )
         # return the calendar object
         return created_calendar
 
-    def add_manager(self, calendar_id: str, email: str) -> bool:
+    async def create_calendars(
+        self, summaries: Mapping[str, str]
+    ) -> Dict[str, Union[Calendar, Exception]]:
+        """Creates several new public calendars on the service account given their names,
+        using one batch request to create the calendars and another to make them public
+
+        Args:
+            summaries (Mapping[str, str]): The names of the calendars to create, keyed by an ID of your choice.
+
+        Returns:
+            Dict[str, Union[Calendar, Exception]]: The created calendar, or the exception which prevented it from being created or made public, keyed by the given IDs. A calendar which couldn't be made public even when retried is deleted, so that it isn't left orphaned.
+        """
+        # create the calendars
+        created = await self.executor.execute_batch(
+            self.service,
+            {
+                key: self.service.calendars().insert(
+                    body={"summary": summary, "timeZone": self.timezone}
+                )
+                for key, summary in summaries.items()
+            },
+        )
+        results: Dict[str, Union[Calendar, Exception]] = {
+            key: response if isinstance(response, Exception) else Calendar.from_dict(response)
+            for key, response in created.items()
+        }
+        # make the calendars which were created public
+        calendars = {key: result for key, result in results.items() if isinstance(result, Calendar)}
+        shared = await self.executor.execute_batch(
+            self.service,
+            {
+                key: self.service.acl().insert(calendarId=calendar.id, body=self.__PUBLIC_RULE)
+                for key, calendar in calendars.items()
+            },
+        )
+        # retry the calendars which couldn't be made public one at a time, so none are left orphaned
+        failed = [key for key, response in shared.items() if isinstance(response, Exception)]
+        errors = await asyncio.gather(*(self.__share_or_delete(calendars[key]) for key in failed))
+        for key, error in zip(failed, errors):
+            if error is not None:
+                results[key] = error
+        return results
+
+    async def add_manager(self, calendar_id: str, email: str) -> bool:
         """Gives write access to a user for a calendar given an email address"""
         rule = {
             "scope": {
@@ -218,30 +299,67 @@ class CalendarService:
             },
             "role": "writer",
         }
-        created_rule = self.service.acl().insert(calendarId=calendar_id, body=rule).execute()
+        created_rule = await self.executor.execute(
+            self.service.acl().insert(calendarId=calendar_id, body=rule)
+        )
         # returns True if the rule was applied successfully
         return created_rule["id"] == f"user:{email}"
 
+    async def __share_or_delete(self, calendar: Calendar) -> Optional[Exception]:
+        """Make a calendar public, or delete it if that fails
+
+        Returns:
+            Optional[Exception]: The exception which prevented the calendar from being made public, or None if it was.
+        """
+        try:
+            await self.executor.execute(
+                self.service.acl().insert(calendarId=calendar.id, body=self.__PUBLIC_RULE)
+            )
+            return None
+        except Exception as error:
+            try:
+                await self.executor.execute(self.service.calendars().delete(calendarId=calendar.id))
+            except Exception as delete_error:
+                return RuntimeError(
+                    f"The calendar {calendar.id} couldn't be made public ({error}) or deleted"
+                    f" ({delete_error}), so it must be deleted manually."
+                )
+            return error
+
+    def __now(self) -> datetime:
+        """The current date and time in the calendar's timezone (event times are stored without one)"""
+        return datetime.now(ZoneInfo(self.timezone)).replace(tzinfo=None)
+
+    def __store(self, calendar_id: str) -> EventStore:
+        """Get the event store of a calendar, creating it if this is the first time it is used"""
+        if calendar_id not in self.__stores:
+            self.__stores[calendar_id] = EventStore(
+                calendar_id,
+                self.service,
+                self.executor,
+                self.__dict_to_event,
+                config.calendar_sync_interval,
+                timedelta(days=config.calendar_sync_history_days),
+            )
+        return self.__stores[calendar_id]
+
     def __dict_to_event(self, details: Dict[str, Any]) -> Event:
         """Create an event from a JSON object as returned by the Calendar API"""
-        desc = details.get("description")
         return Event(
             event_id=details["id"],
             link=details["htmlLink"],
-            title=details["summary"],
+            title=details.get("summary", ""),
             all_day=("date" in details["start"]),
             location=details.get("location"),
-            description=html_to_md(desc) if desc else None,
+            html_description=details.get("description"),
             start=self.__get_endpoint_datetime(details, "start"),
             end=self.__get_endpoint_datetime(details, "end"),
         )
 
     def __get_endpoint_datetime(self, details: Dict[str, Any], endpoint: str) -> datetime:
         """Returns a datetime given 'start' or 'end' as the endpoint"""
-        dt = parse_date(
+        return parse_api_datetime(
             details[endpoint].get("dateTime") or details[endpoint]["date"],
             from_tz=details[endpoint].get("timeZone") or self.timezone,
             to_tz=self.timezone,
         )
-        assert dt is not None
-        return dt
@@ -1,31 +1,43 @@
-from typing import Optional
+import secrets
+from collections import OrderedDict
+from typing import Optional, Tuple, Union
 
 import nextcord
 from nextcord.ext import commands
 
 import config
 from database import preloaded
-from database.group import Group
 from utils.embedder import embed_success
-from utils.utils import is_email
+from utils.utils import is_email, one, set_option_choices
 
 from ..error.friendly_error import FriendlyError
-from . import course_mentions
+from . import components, course_mentions
 from .calendar import Calendar
 from .calendar_creator import CalendarCreator
 from .calendar_embedder import CalendarEmbedder
 from .calendar_service import CalendarService
+from .components import EventChoice, PageRequest
+from .event import Event
+
+# the new title, start, end, description and location given to /calendar update
+PendingUpdate = Tuple[Optional[str], Optional[str], Optional[str], Optional[str], Optional[str]]
 
 
 class CalendarCog(commands.Cog):
     """Display and update Google Calendar events"""
 
+    # the maximum number of updates kept while waiting for the user to choose the event
+    __MAX_PENDING_UPDATES = 100
+
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         timezone = "Asia/Jerusalem"
         self.embedder = CalendarEmbedder(bot, timezone)
         self.service = CalendarService(timezone)
         self.creator = CalendarCreator(self.service)
+        # changes to apply once the user chooses the event to update, keyed by a random token
+        self.__pending_updates: OrderedDict[str, PendingUpdate] = OrderedDict()
+        preloaded.add_listener(self.__update_class_choices)
 
     @nextcord.slash_command(guild_ids=[config.guild_id])
     async def calendar(self, interaction: nextcord.Interaction[commands.Bot]):
@@ -47,7 +59,7 @@ class CalendarCog(commands.Cog):
             group_id: Calendar to show links for (eg. Lev 2023). Leave blank if you have only one class role.
         """
         # get calendar from selected class_role or author
-        calendar = await Calendar.get_calendar(interaction, await Group.get_groups(), group_id)
+        calendar = await Calendar.get_calendar(interaction, group_id=group_id)
         # fetch links for calendar
         links = self.service.get_links(calendar)
         embed = self.embedder.embed_links(f"🔗 Calendar Links for {calendar.name}", links)
@@ -63,6 +75,13 @@ class CalendarCog(commands.Cog):
             name="class_name",
             choices={group.name: group.id for group in preloaded.groups},
         ),
+        page: int = 1,
+        scope: str = nextcord.SlashOption(
+            name="classes",
+            choices={description: scope for scope, description in Calendar.SCOPES.items()},
+            required=False,
+            default="",
+        ),
     ):
         """Display upcoming events from the Google Calendar
 
@@ -72,18 +91,92 @@ class CalendarCog(commands.Cog):
             results_per_page: Number of events to display per page. (Default: 5)
             group_id: Calendar to show events for (eg. Lev 2023). Leave blank if you have only one
                 class role.
+            page: Page of results to show. (Default: 1)
+            scope: Show events from the calendars of all your classes or of all classes at once,
+                instead of a single class.
         """
         await interaction.response.defer()
-        # get calendar from selected class_role or author
-        calendar = await Calendar.get_calendar(interaction, await Group.get_groups(), group_id)
         # convert channel mentions to full names
         full_query = await course_mentions.replace_channel_mentions(query)
-        # fetch upcoming events
-        events = self.service.fetch_upcoming(calendar.id, full_query)
-        # display events and allow showing more with reactions
-        await self.embedder.embed_event_pages(
-            interaction, events, full_query, results_per_page, calendar
+        # display a page of upcoming events with buttons for showing the others
+        embed, view = await self.__upcoming_page(
+            interaction,
+            full_query,
+            interaction.user.id if interaction.user else 0,
+            results_per_page,
+            page,
+            group_id,
+            scope,
+        )
+        await interaction.edit_original_message(embed=embed, view=view)
+
+    @calendar.subcommand(name="next")
+    async def next_event(
+        self,
+        interaction: nextcord.Interaction[commands.Bot],
+        group_id: Optional[int] = nextcord.SlashOption(
+            name="class_name",
+            choices={group.name: group.id for group in preloaded.groups},
+        ),
+    ):
+        """Display the next event from the Google Calendar
+
+        Args:
+            group_id: Calendar to show the next event for (eg. Lev 2023). Leave blank if you have
+                only one class role.
+        """
+        await interaction.response.defer()
+        # get calendar from selected class_role or author
+        calendar = await Calendar.get_calendar(interaction, group_id=group_id)
+        event = await self.service.fetch_next(calendar.id)
+        if event is None:
+            raise FriendlyError(
+                f"There are no upcoming events in the {calendar.name} calendar.",
+                interaction,
+                interaction.user,
+            )
+        embed = self.embedder.embed_event(
+            f"⏭ Next Event for {calendar.name}", event, calendar, colour=nextcord.Colour.blue()
         )
+        await interaction.send(embed=embed)
+
+    @calendar.subcommand(name="today")
+    async def events_today(
+        self,
+        interaction: nextcord.Interaction[commands.Bot],
+        results_per_page: int = 5,
+        group_id: Optional[int] = nextcord.SlashOption(
+            name="class_name",
+            choices={group.name: group.id for group in preloaded.groups},
+        ),
+    ):
+        """Display today's events from the Google Calendar
+
+        Args:
+            results_per_page: Number of events to display per page. (Default: 5)
+            group_id: Calendar to show events for (eg. Lev 2023). Leave blank if you have only one
+                class role.
+        """
+        await self.__show_period(interaction, "today", results_per_page, group_id)
+
+    @calendar.subcommand(name="week")
+    async def events_week(
+        self,
+        interaction: nextcord.Interaction[commands.Bot],
+        results_per_page: int = 5,
+        group_id: Optional[int] = nextcord.SlashOption(
+            name="class_name",
+            choices={group.name: group.id for group in preloaded.groups},
+        ),
+    ):
+        """Display the events of the next 7 days from the Google Calendar
+
+        Args:
+            results_per_page: Number of events to display per page. (Default: 5)
+            group_id: Calendar to show events for (eg. Lev 2023). Leave blank if you have only one
+                class role.
+        """
+        await self.__show_period(interaction, "week", results_per_page, group_id)
 
     @calendar.subcommand(name="add")
     async def event_add(
@@ -115,9 +208,11 @@ class CalendarCog(commands.Cog):
         description = await course_mentions.replace_channel_mentions(description)
         location = await course_mentions.replace_channel_mentions(location)
         # get calendar from selected class_role or author
-        calendar = await Calendar.get_calendar(interaction, await Group.get_groups(), group_id)
+        calendar = await Calendar.get_calendar(interaction, group_id=group_id)
         try:
-            event = self.service.add_event(calendar.id, title, start, end, description, location)
+            event = await self.service.add_event(
+                calendar.id, title, start, end, description, location
+            )
         except ValueError as error:
             raise FriendlyError(str(error), interaction, interaction.user, error)
         embed = self.embedder.embed_event(
@@ -158,45 +253,22 @@ class CalendarCog(commands.Cog):
         # replace channel mentions with course names
         query = await course_mentions.replace_channel_mentions(query)
         # get calendar from selected class_role or author
-        calendar = await Calendar.get_calendar(interaction, await Group.get_groups(), group_id)
+        calendar = await Calendar.get_calendar(interaction, group_id=group_id)
         # get a list of upcoming events
-        events = self.service.fetch_upcoming(calendar.id, query)
+        events = await self.service.fetch_upcoming(calendar.id, query)
+        # identifies the changes in the menu, in case the user must choose the event from one
+        token = secrets.token_hex(4)
         # get event to update
         event_to_update = await self.embedder.get_event_choice(
-            interaction, events, calendar, query, "update"
+            interaction, events, calendar, query, "update", token
         )
-        # replace channel mentions and variables
-        if title:
-            title = (await course_mentions.replace_channel_mentions(title)).replace(
-                "${title}", event_to_update.title
-            )
-        if description:
-            description = (
-                (await course_mentions.replace_channel_mentions(description))
-                .replace("${description}", event_to_update.description or "")
-                .replace("\\n", "\n")
-            )
-        if location:
-            location = (await course_mentions.replace_channel_mentions(location)).replace(
-                "${location}", event_to_update.location or ""
-            )
-        try:
-            event = self.service.update_event(
-                calendar.id,
-                event_to_update,
-                title,
-                start,
-                end,
-                description,
-                location,
-            )
-        except ValueError as error:
-            raise FriendlyError(error.args[0], interaction, interaction.user, error)
-        embed = self.embedder.embed_event(
-            ":white_check_mark: Event updated successfully", event, calendar
+        # if there are several events, the changes are applied once the user chooses one
+        if event_to_update is None:
+            self.__remember_update(token, (title, start, end, description, location))
+            return
+        await self.__update_event(
+            interaction, calendar, event_to_update, title, start, end, description, location
         )
-        # edit message if sent already, otherwise send
-        await interaction.edit_original_message(embed=embed)
 
     @calendar.subcommand(name="delete")
     async def event_delete(
@@ -218,21 +290,17 @@ class CalendarCog(commands.Cog):
         # replace channel mentions with course names
         query = await course_mentions.replace_channel_mentions(query)
         # get calendar from selected class_role or author
-        calendar = await Calendar.get_calendar(interaction, await Group.get_groups(), group_id)
+        calendar = await Calendar.get_calendar(interaction, group_id=group_id)
         # fetch upcoming events
-        events = self.service.fetch_upcoming(calendar.id, query)
+        events = await self.service.fetch_upcoming(calendar.id, query)
         # get event to delete
         event_to_delete = await self.embedder.get_event_choice(
             interaction, events, calendar, query, "delete"
         )
-        # delete event
-        try:
-            self.service.delete_event(calendar.id, event_to_delete)
-        except ConnectionError as error:
-            raise FriendlyError(error.args[0], interaction, interaction.user, error)
-        embed = self.embedder.embed_event("🗑 Event deleted successfully", event_to_delete, calendar)
-        # edit message if sent already, otherwise send
-        await interaction.edit_original_message(embed=embed)
+        # if there are several events, it is deleted once the user chooses one
+        if event_to_delete is None:
+            return
+        await self.__delete_event(interaction, calendar, event_to_delete)
 
     @calendar.subcommand(name="grant")
     async def calendar_grant(
@@ -252,12 +320,7 @@ class CalendarCog(commands.Cog):
         """
         await interaction.response.defer(ephemeral=True)
         # get calendar from selected class_role or author
-        calendar = await Calendar.get_calendar(
-            interaction,
-            await Group.get_groups(),
-            group_id,
-            ephemeral=True,
-        )
+        calendar = await Calendar.get_calendar(interaction, group_id=group_id, ephemeral=True)
         # validate email address
         if not is_email(email):
             raise FriendlyError(
@@ -267,7 +330,7 @@ class CalendarCog(commands.Cog):
                 ephemeral=True,
             )
         # add manager to calendar
-        if self.service.add_manager(calendar.id, email):
+        if await self.service.add_manager(calendar.id, email):
             embed = embed_success(f":office_worker: Successfully added manager to {calendar.name}.")
             await interaction.send(embed=embed, ephemeral=True)
             return
@@ -278,6 +341,249 @@ class CalendarCog(commands.Cog):
             ephemeral=True,
         )
 
+    async def __show_period(
+        self,
+        interaction: nextcord.Interaction[commands.Bot],
+        period: str,
+        results_per_page: int,
+        group_id: Optional[int],
+    ):
+        """Display the events of a period with buttons for showing the other pages"""
+        await interaction.response.defer()
+        # get calendar from selected class_role or author
+        calendar = await Calendar.get_calendar(interaction, group_id=group_id)
+        events = await self.service.fetch_period(calendar.id, period)
+        embed, view = self.embedder.embed_event_page(
+            events,
+            "",
+            calendar,
+            interaction.user.id if interaction.user else 0,
+            results_per_page,
+            period=period,
+        )
+        await interaction.edit_original_message(embed=embed, view=view)
+
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction: nextcord.Interaction[commands.Bot]):
+        """Handle clicks on the buttons and select menus of calendar messages"""
+        if interaction.type != nextcord.InteractionType.component or interaction.data is None:
+            return
+        request = components.parse(str(interaction.data.get("custom_id", "")))
+        if request is None:
+            return
+        try:
+            await self.__handle_component(interaction, request)
+        except Exception as error:
+            # errors raised in a listener reach on_error without the interaction, so handle them
+            # like errors in commands, which answers the user instead of leaving them waiting
+            self.bot.dispatch("application_command_error", interaction, error)
+
+    async def __handle_component(
+        self,
+        interaction: nextcord.Interaction[commands.Bot],
+        request: Union[PageRequest, EventChoice],
+    ):
+        """Respond to a click on a button or select menu of a calendar message"""
+        # only the user who ran the command may use its components
+        if interaction.user is None or interaction.user.id != request.user_id:
+            raise FriendlyError(
+                "Only the person who ran the command can do that.",
+                interaction,
+                interaction.user,
+                ephemeral=True,
+            )
+        await interaction.response.defer()
+        if isinstance(request, PageRequest):
+            await self.__show_page(interaction, request)
+        else:
+            calendar = await Calendar.get_calendar(
+                interaction, group_id=request.group_id, ephemeral=True
+            )
+            await self.__apply_choice(interaction, calendar, request)
+
+    async def __show_page(
+        self,
+        interaction: nextcord.Interaction[commands.Bot],
+        request: PageRequest,
+    ):
+        """Replace the page of events shown in the message with the requested page"""
+        if request.period:
+            calendar = await Calendar.get_calendar(
+                interaction, group_id=request.group_id, ephemeral=True
+            )
+            events = await self.service.fetch_period(calendar.id, request.period)
+            embed, view = self.embedder.embed_event_page(
+                events,
+                "",
+                calendar,
+                request.user_id,
+                request.results_per_page,
+                request.page_num,
+                request.period,
+            )
+        else:
+            if request.query is None:
+                raise FriendlyError(
+                    "These results have expired. Please run the command again.",
+                    interaction,
+                    interaction.user,
+                    ephemeral=True,
+                )
+            embed, view = await self.__upcoming_page(
+                interaction,
+                request.query,
+                request.user_id,
+                request.results_per_page,
+                request.page_num,
+                request.group_id,
+                request.scope,
+                ephemeral=True,
+            )
+        await interaction.edit_original_message(embed=embed, view=view)
+
+    async def __upcoming_page(
+        self,
+        interaction: nextcord.Interaction[commands.Bot],
+        query: str,
+        user_id: int,
+        results_per_page: int,
+        page_num: int,
+        group_id: Optional[int],
+        scope: str,
+        ephemeral: bool = False,
+    ) -> Tuple[nextcord.Embed, nextcord.ui.View]:
+        """Embed a page of the upcoming events which match the query, either from the calendar
+        of the given group (or the user's group) or from all the calendars of a scope"""
+        if not scope:
+            # get calendar from selected class_role or author
+            calendar = await Calendar.get_calendar(
+                interaction, group_id=group_id, ephemeral=ephemeral
+            )
+            events = await self.service.fetch_upcoming(calendar.id, query)
+            return self.embedder.embed_event_page(
+                events, query, calendar, user_id, results_per_page, page_num
+            )
+        # search the calendars of the scope concurrently and merge their events
+        calendars = {
+            calendar.id: calendar
+            for calendar in await Calendar.get_calendars(interaction, scope, ephemeral=ephemeral)
+        }
+        merged = await self.service.fetch_upcoming_merged(list(calendars), query)
+        return self.embedder.embed_event_page(
+            [event for _, event in merged],
+            query,
+            None,
+            user_id,
+            results_per_page,
+            page_num,
+            scope=scope,
+            sources={event: calendars[calendar_id] for calendar_id, event in merged},
+        )
+
+    async def __apply_choice(
+        self,
+        interaction: nextcord.Interaction[commands.Bot],
+        calendar: Calendar,
+        choice: EventChoice,
+    ):
+        """Apply the action waiting for the user to choose an event to the event chosen"""
+        # the value of the option chosen is the event id
+        values = interaction.data.get("values", []) if interaction.data else []
+        event_id = one(values) if isinstance(values, list) else ""
+        event = await self.service.get_event(calendar.id, str(event_id))
+        if event is None:
+            raise FriendlyError(
+                "The event you chose no longer exists.",
+                interaction,
+                interaction.user,
+                ephemeral=True,
+            )
+        if choice.action == "delete":
+            await self.__delete_event(interaction, calendar, event)
+        elif choice.action == "update":
+            changes = self.__pending_updates.pop(choice.token, None)
+            if changes is None:
+                raise FriendlyError(
+                    "This choice has expired. Please run the command again.",
+                    interaction,
+                    interaction.user,
+                    ephemeral=True,
+                )
+            await self.__update_event(interaction, calendar, event, *changes)
+
+    def __remember_update(self, token: str, changes: PendingUpdate):
+        """Keep the changes to apply once the user chooses the event to update,
+        forgetting the oldest changes if there are too many"""
+        self.__pending_updates[token] = changes
+        if len(self.__pending_updates) > self.__MAX_PENDING_UPDATES:
+            self.__pending_updates.popitem(last=False)
+
+    async def __update_event(
+        self,
+        interaction: nextcord.Interaction[commands.Bot],
+        calendar: Calendar,
+        event_to_update: Event,
+        title: Optional[str],
+        start: Optional[str],
+        end: Optional[str],
+        description: Optional[str],
+        location: Optional[str],
+    ):
+        """Apply the changes given to `/calendar update` to an event and show the updated event"""
+        # replace channel mentions and variables
+        if title:
+            title = (await course_mentions.replace_channel_mentions(title)).replace(
+                "${title}", event_to_update.title
+            )
+        if description:
+            description = (
+                (await course_mentions.replace_channel_mentions(description))
+                .replace("${description}", event_to_update.description or "")
+                .replace("\\n", "\n")
+            )
+        if location:
+            location = (await course_mentions.replace_channel_mentions(location)).replace(
+                "${location}", event_to_update.location or ""
+            )
+        try:
+            event = await self.service.update_event(
+                calendar.id,
+                event_to_update,
+                title,
+                start,
+                end,
+                description,
+                location,
+            )
+        except ValueError as error:
+            raise FriendlyError(error.args[0], interaction, interaction.user, error)
+        embed = self.embedder.embed_event(
+            ":white_check_mark: Event updated successfully", event, calendar
+        )
+        # edit message if sent already, otherwise send
+        await interaction.edit_original_message(embed=embed, view=None)
+
+    async def __delete_event(
+        self,
+        interaction: nextcord.Interaction[commands.Bot],
+        calendar: Calendar,
+        event_to_delete: Event,
+    ):
+        """Delete an event and show the deleted event"""
+        try:
+            await self.service.delete_event(calendar.id, event_to_delete)
+        except ConnectionError as error:
+            raise FriendlyError(error.args[0], interaction, interaction.user, error)
+        embed = self.embedder.embed_event("🗑 Event deleted successfully", event_to_delete, calendar)
+        # edit message if sent already, otherwise send
+        await interaction.edit_original_message(embed=embed, view=None)
+
+    async def __update_class_choices(self):
+        """Update the choices of the class_name options after the groups have changed."""
+        set_option_choices(
+            self.calendar, "class_name", {group.name: group.id for group in preloaded.groups}
+        )
+
 
 # setup functions for bot
 def setup(bot):
@@ -0,0 +1,231 @@
+"""
+This module defines the buttons and select menus attached to calendar messages.
+
+Everything needed to handle a click is encoded in the custom_id of the component,
+so nothing waits on a message while it is open and the components keep working
+after the bot restarts. The only exception is a query too long to fit in a
+custom_id, which is kept in memory instead and replaced by a short key to it.
+The calendar cog routes every component interaction whose custom_id starts with
+`PREFIX` to the right handler, using `parse()` to recover the `PageRequest` or
+`EventChoice` the component was created from.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import List, Optional, Union
+
+import nextcord
+
+# The first part of the custom_id of every calendar component
+PREFIX = "calendar"
+
+# The maximum length of a custom_id allowed by Discord
+MAX_CUSTOM_ID_LENGTH = 100
+
+# The queries which didn't fit in a custom_id, keyed by a hash of the query
+_long_queries: OrderedDict[str, str] = OrderedDict()
+# The maximum number of queries kept in memory before the oldest ones are forgotten
+_MAX_LONG_QUERIES = 256
+
+
+class PageRequest:
+    """A request for a page of upcoming events, as encoded in the button which shows the page"""
+
+    KIND = "page"
+
+    def __init__(
+        self,
+        group_id: int,
+        user_id: int,
+        page_num: int,
+        results_per_page: int,
+        period: str = "",
+        scope: str = "",
+        query: Optional[str] = "",
+    ):
+        """
+        Args:
+            group_id (int): The id of the group whose calendar the events are from (0 if they are from a scope).
+            user_id (int): The id of the user who is allowed to turn the pages.
+            page_num (int): The number of the page to show, starting from 1.
+            results_per_page (int): The maximum number of events to show on the page.
+            period (str, optional): The period the events are from (see `CalendarService.PERIODS`), or "" for all the upcoming events which match the query shown on the page.
+            scope (str, optional): The calendars the events are from (see `Calendar.SCOPES`), or "" if they are from the group's calendar.
+            query (Optional[str], optional): The query the events were searched for with, or None if it was too long to be kept in the custom_id and has since been forgotten.
+        """
+        self.__group_id = group_id
+        self.__user_id = user_id
+        self.__page_num = page_num
+        self.__results_per_page = results_per_page
+        self.__period = period
+        self.__scope = scope
+        self.__query = query
+
+    @property
+    def group_id(self) -> int:
+        return self.__group_id
+
+    @property
+    def user_id(self) -> int:
+        return self.__user_id
+
+    @property
+    def page_num(self) -> int:
+        return self.__page_num
+
+    @property
+    def results_per_page(self) -> int:
+        return self.__results_per_page
+
+    @property
+    def period(self) -> str:
+        return self.__period
+
+    @property
+    def scope(self) -> str:
+        return self.__scope
+
+    @property
+    def query(self) -> Optional[str]:
+        return self.__query
+
+    @property
+    def custom_id(self) -> str:
+        fields = ":".join(
+            map(
+                str,
+                (
+                    PREFIX,
+                    self.KIND,
+                    self.__group_id,
+                    self.__user_id,
+                    self.__page_num,
+                    self.__results_per_page,
+                    self.__period,
+                    self.__scope,
+                ),
+            )
+        )
+        # the query comes last, since it may contain colons
+        return (
+            f"{fields}:{_encode_query(self.__query or '', MAX_CUSTOM_ID_LENGTH - len(fields) - 1)}"
+        )
+
+    def button(self, label: str, emoji: str, disabled: bool = False) -> nextcord.ui.Button:
+        """A button which shows the requested page when clicked"""
+        return nextcord.ui.Button(
+            style=nextcord.ButtonStyle.secondary,
+            label=label,
+            emoji=emoji,
+            custom_id=self.custom_id,
+            disabled=disabled,
+        )
+
+
+class EventChoice:
+    """An action waiting for the user to choose which event to apply it to,
+    as encoded in the select menu of events to choose from"""
+
+    KIND = "choice"
+
+    def __init__(self, action: str, group_id: int, user_id: int, token: str = ""):
+        """
+        Args:
+            action (str): The action to apply to the chosen event ("update" or "delete").
+            group_id (int): The id of the group whose calendar the events are from.
+            user_id (int): The id of the user who is allowed to choose.
+            token (str, optional): Identifies the details of the action which don't fit in the custom_id, if any.
+        """
+        self.__action = action
+        self.__group_id = group_id
+        self.__user_id = user_id
+        self.__token = token
+
+    @property
+    def action(self) -> str:
+        return self.__action
+
+    @property
+    def group_id(self) -> int:
+        return self.__group_id
+
+    @property
+    def user_id(self) -> int:
+        return self.__user_id
+
+    @property
+    def token(self) -> str:
+        return self.__token
+
+    @property
+    def custom_id(self) -> str:
+        return ":".join(
+            map(
+                str,
+                (PREFIX, self.KIND, self.__action, self.__group_id, self.__user_id, self.__token),
+            )
+        )
+
+    def select(self, options: List[nextcord.SelectOption]) -> nextcord.ui.StringSelect:
+        """A select menu with the given events as options, whose values are the event ids"""
+        return nextcord.ui.StringSelect(
+            custom_id=self.custom_id,
+            placeholder=f"Choose the event to {self.__action}",
+            options=options,
+        )
+
+
+def view(*items: nextcord.ui.Item) -> nextcord.ui.View:
+    """Create a view holding the given components to send with a message.
+
+    The view is stopped before it is sent so that nextcord doesn't keep it in memory,
+    since the cog handles the interactions with its components.
+    """
+    result = nextcord.ui.View(timeout=None, prevent_update=False)
+    for item in items:
+        result.add_item(item)
+    result.stop()
+    return result
+
+
+def parse(custom_id: str) -> Optional[Union[PageRequest, EventChoice]]:
+    """Recover the request encoded in the custom_id of a calendar component,
+    or None if the custom_id doesn't belong to one"""
+    prefix, _, rest = custom_id.partition(":")
+    if prefix != PREFIX:
+        return None
+    kind, _, rest = rest.partition(":")
+    try:
+        if kind == PageRequest.KIND:
+            *numbers, period, scope, query = rest.split(":", 6)
+            group_id, user_id, page_num, results_per_page = map(int, numbers)
+            return PageRequest(
+                group_id, user_id, page_num, results_per_page, period, scope, _decode_query(query)
+            )
+        if kind == EventChoice.KIND:
+            action, group, user, token = rest.split(":")
+            return EventChoice(action, int(group), int(user), token)
+    except ValueError:
+        # the custom_id is malformed
+        pass
+    return None
+
+
+def _encode_query(query: str, max_length: int) -> str:
+    """The query as it is written in a custom_id, in at most `max_length` characters:
+    either the query itself, or a key to it if it is too long"""
+    if len(query) + 1 <= max_length:
+        return f"={query}"
+    key = hashlib.blake2b(query.encode(), digest_size=8).hexdigest()
+    _long_queries[key] = query
+    _long_queries.move_to_end(key)
+    if len(_long_queries) > _MAX_LONG_QUERIES:
+        _long_queries.popitem(last=False)
+    return f"#{key}"
+
+
+def _decode_query(encoded: str) -> Optional[str]:
+    """Recover a query written in a custom_id by `_encode_query`, or None if it has been forgotten"""
+    if encoded.startswith("#"):
+        return _long_queries.get(encoded[1:])
+    return encoded.removeprefix("=")
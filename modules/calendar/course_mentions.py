@@ -1,39 +1,36 @@
+import re
+from typing import Mapping
+
 import config
-from database import sql
-from utils.mention import decode_channel_mention
+from database.course_directory import directory as course_directory
+
+# a channel mention, capturing the ID of the channel
+__CHANNEL_MENTION_REGEX = re.compile(r"<#!?(\d+)>")
 
 
-async def get_channel_full_name(channel_id: int) -> str:
-    """Searches the database for the course name given the channel id
+def get_channel_full_name(channel_id: int, course_names: Mapping[int, str]) -> str:
+    """Finds the course name given the channel id
 
     Args:
         channel_id (int): The ID of the channel to search for.
+        course_names (Mapping[int, str]): The names of the courses, keyed by the IDs of their channels.
 
     Returns:
         str: The name of the course linked to the channel, or the name of the channel if it doesn't belong to a course.
     """
-    name = await sql.select.value("categories", "name", channel=channel_id)
+    name = course_names.get(channel_id)
     if name:
         return name
     channel = config.guild().get_channel(channel_id)
     return channel.name if channel else f"<#{channel_id}>"
 
 
-async def map_channel_mention(word: str) -> str:
-    """given a word in a string, return the channel name
-    if it is a channel mention, otherwise return the original word"""
-    channel_id = decode_channel_mention(word)
-    # convert mention to full name if word is a mention
-    if channel_id:
-        return await get_channel_full_name(channel_id)
-    # not a channel mention
-    return word
-
-
 async def replace_channel_mentions(text: str) -> str:
-    return " ".join(
-        [
-            await map_channel_mention(word)
-            for word in text.replace("<", " <").replace(">", "> ").split()
-        ]
+    """Replace the channel mentions in the text with the names of their courses (or channels).
+    Mentions are separated from the surrounding words by a space and runs of whitespace are collapsed.
+    """
+    course_names = await course_directory.names_by_channel()
+    text = " ".join(text.replace("<", " <").replace(">", "> ").split())
+    return __CHANNEL_MENTION_REGEX.sub(
+        lambda match: get_channel_full_name(int(match.group(1)), course_names), text
     )
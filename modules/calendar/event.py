@@ -1,8 +1,12 @@
 from datetime import datetime, timedelta
 from typing import Optional
 
+from rapidfuzz.utils import default_process
+
 from utils.utils import format_date
 
+from .md_html_converter import html_to_md
+
 
 class Event:
     """Event object to store data about a Google Calendar event"""
@@ -13,7 +17,7 @@ class Event:
         link: str,
         title: str,
         location: Optional[str],
-        description: Optional[str],
+        html_description: Optional[str],
         all_day: bool,
         start: datetime,
         end: datetime,
@@ -22,10 +26,15 @@ class Event:
         self.__link = link
         self.__title = title
         self.__location = location
-        self.__description = description
+        self.__html_description = html_description
+        # converted to markdown the first time it is used, since most events are never displayed
+        self.__description: Optional[str] = None
         self.__all_day = all_day
         self.__start = start.replace(tzinfo=None)
         self.__end = end.replace(tzinfo=None)
+        # forms of the title used for searching, computed once since events are searched many times
+        self.__normalised_title = default_process(title)
+        self.__compact_title = title.lower().replace(" ", "")
 
     @property
     def id(self) -> str:
@@ -42,6 +51,16 @@ class Event:
         """Returns the title of the event"""
         return self.__title
 
+    @property
+    def normalised_title(self) -> str:
+        """Returns the title in lowercase with punctuation replaced by spaces, for fuzzy matching"""
+        return self.__normalised_title
+
+    @property
+    def compact_title(self) -> str:
+        """Returns the title in lowercase without spaces, for substring matching"""
+        return self.__compact_title
+
     @property
     def location(self) -> Optional[str]:
         """Returns the location of the event"""
@@ -49,7 +68,9 @@ class Event:
 
     @property
     def description(self) -> Optional[str]:
-        """Returns the description of the event"""
+        """Returns the description of the event in markdown"""
+        if self.__description is None and self.__html_description:
+            self.__description = html_to_md(self.__html_description)
         return self.__description
 
     @property
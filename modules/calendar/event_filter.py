@@ -0,0 +1,43 @@
+from typing import List, Sequence, Tuple
+
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
+
+from .event import Event
+
+# Events whose title scores above this against the query (out of 100) are matches
+MATCH_THRESHOLD = 75
+
+
+def match_events(query: str, events: Sequence[Event]) -> List[Tuple[Event, float]]:
+    """Find the events whose titles match the query, and score how well they match.
+
+    An event matches if the query is contained in its title (ignoring case and spaces), in which case its score is 100, or if the token set ratio of the query and its title is above `MATCH_THRESHOLD`. All the titles are scored in a single call to the matcher.
+
+    Args:
+        query (str): The search term. If empty, every event matches.
+        events (Sequence[Event]): The events to search.
+
+    Returns:
+        List[Tuple[Event, float]]: The matching events with their scores, in the same order as `events`.
+    """
+    compact_query = query.lower().replace(" ", "")
+    if not compact_query:
+        return [(event, 100.0) for event in events]
+    scores = {
+        index: score
+        for _, score, index in process.extract(
+            default_process(query),
+            [event.normalised_title for event in events],
+            scorer=fuzz.token_set_ratio,
+            processor=None,
+            limit=None,
+            # scores are compared after rounding to the nearest integer
+            score_cutoff=MATCH_THRESHOLD + 0.5,
+        )
+    }
+    return [
+        (event, 100.0 if compact_query in event.compact_title else scores[index])
+        for index, event in enumerate(events)
+        if index in scores or compact_query in event.compact_title
+    ]
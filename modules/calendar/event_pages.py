@@ -0,0 +1,95 @@
+from typing import Dict, List, Sequence, Tuple
+
+from utils.embedder import MAX_EMBED_DESCRIPTION_LENGTH
+
+
+class EventPages:
+    """The formatted events of a list, laid out into pages which each fit in an embed's description.
+
+    The page boundaries are computed in a single pass over the events when the layout is created, so the number of pages is known up front and any page can be rendered directly. Rendered pages are kept, so showing a page again costs nothing.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[str],
+        header: str,
+        links: str,
+        max_results: int,
+        enumeration: Sequence[str] = (),
+    ):
+        """
+        Args:
+            entries (Sequence[str]): The formatted events, in the order to display them.
+            header (str): The text to display above the events on every page.
+            links (str): The text to display below the events on every page.
+            max_results (int): The maximum number of events on each page.
+            enumeration (Sequence[str], optional): Emojis to display alongside the events of each page, in order. If given, there are at most as many events on a page as there are emojis.
+        """
+        self.__entries = entries
+        self.__header = f"{header}\n" if header else ""
+        self.__links = links
+        self.__enumeration = enumeration
+        # limit max results to the number of emojis in the enumeration
+        self.__max_results = min(max_results, len(enumeration)) if enumeration else max_results
+        # the index of the first event on each page, and one past the last event on the last page
+        self.__bounds = self.__layout()
+        self.__rendered: Dict[int, str] = {}
+
+    @property
+    def page_count(self) -> int:
+        """The number of pages (there is always at least one, even if there are no events)"""
+        return max(len(self.__bounds) - 1, 1)
+
+    def bounds(self, page_num: int) -> Tuple[int, int]:
+        """The index of the first event on the page and one past the index of its last event
+
+        Args:
+            page_num (int): The number of the page, starting from 1.
+        """
+        if not self.__entries:
+            return 0, 0
+        return self.__bounds[page_num - 1], self.__bounds[page_num]
+
+    def render(self, page_num: int) -> str:
+        """The description of the embed of the page, including the header and the links
+
+        Args:
+            page_num (int): The number of the page, starting from 1.
+        """
+        if page_num not in self.__rendered:
+            if self.__entries:
+                start, end = self.bounds(page_num)
+                events_text = "".join(
+                    self.__enumerated(entry, i) for i, entry in enumerate(self.__entries[start:end])
+                )
+            else:
+                events_text = "No events found.\n"
+            self.__rendered[page_num] = self.__header + events_text + self.__links
+        return self.__rendered[page_num]
+
+    def __enumerated(self, entry: str, index: int) -> str:
+        """The entry as displayed at the given position on its page"""
+        emoji = self.__enumeration[index] if index < len(self.__enumeration) else ""
+        return f"\n{emoji} {entry}"
+
+    def __layout(self) -> List[int]:
+        """Split the entries into pages, making sure no page exceeds the maximum description length
+        (unless an event won't fit on its own page)"""
+        bounds = [0]
+        fixed_length = len(self.__header) + len(self.__links)
+        length = fixed_length
+        count = 0
+        for i, entry in enumerate(self.__entries):
+            entry_length = len(self.__enumerated(entry, count))
+            if count == self.__max_results or (
+                count > 0 and length + entry_length > MAX_EMBED_DESCRIPTION_LENGTH
+            ):
+                # start a new page with this event
+                bounds.append(i)
+                length = fixed_length
+                count = 0
+                entry_length = len(self.__enumerated(entry, count))
+            length += entry_length
+            count += 1
+        bounds.append(len(self.__entries))
+        return bounds
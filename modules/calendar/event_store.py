@@ -0,0 +1,174 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Collection, Dict, Optional
+
+from googleapiclient.errors import HttpError
+
+from utils.google_executor import GoogleExecutor
+
+from .event import Event
+from .timeline import Timeline
+
+
+class EventStore:
+    """An in-memory copy of the events of a single Google Calendar.
+
+    The first read downloads every event of the calendar which ended at most `history` ago (older events are never shown, so they aren't kept). After that, reads are served from memory and, once the copy is older than `max_age` seconds, the next read asks the Calendar API only for the events which changed since the previous sync (using its sync token). Changes made by the bot itself are written through to the store with `put()` and `remove()`. The events are also kept sorted by start time in a `Timeline`, which is updated along with them.
+    """
+
+    # maximum number of events the API may return per page
+    __PAGE_SIZE = 2500
+
+    def __init__(
+        self,
+        calendar_id: str,
+        service: Any,
+        executor: GoogleExecutor,
+        to_event: Callable[[Dict[str, Any]], Event],
+        max_age: float,
+        history: timedelta,
+    ):
+        """Create an empty store for a calendar. Nothing is downloaded until the first read.
+
+        Args:
+            calendar_id (str): The ID of the calendar whose events to store.
+            service (Any): The Calendar API client.
+            executor (GoogleExecutor): The executor to run requests to the API with.
+            to_event (Callable[[Dict[str, Any]], Event]): Converts an event as returned by the API to an Event object.
+            max_age (float): The number of seconds after a sync before the next read syncs again.
+            history (timedelta): How long before a download of every event the oldest events to download may have ended.
+        """
+        self.__calendar_id = calendar_id
+        self.__service = service
+        self.__executor = executor
+        self.__to_event = to_event
+        self.__max_age = max_age
+        self.__history = history
+        self.__events: Dict[str, Event] = {}
+        self.__timeline = Timeline()
+        self.__sync_token: Optional[str] = None
+        self.__synced_at: Optional[float] = None
+        self.__lock = asyncio.Lock()
+        # the events written through while every event is being downloaded, by ID (None if removed)
+        self.__writes_during_download: Optional[Dict[str, Optional[Event]]] = None
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the next read must sync with the Calendar API first."""
+        return self.__synced_at is None or time.monotonic() - self.__synced_at > self.__max_age
+
+    async def events(self) -> Collection[Event]:
+        """All the events of the calendar, in no particular order."""
+        await self.__ensure_fresh()
+        return self.__events.values()
+
+    async def timeline(self) -> Timeline:
+        """All the events of the calendar, sorted by start time."""
+        await self.__ensure_fresh()
+        return self.__timeline
+
+    async def get(self, event_id: str) -> Optional[Event]:
+        """The event with the given ID, or None if the calendar has no such event."""
+        await self.__ensure_fresh()
+        return self.__events.get(event_id)
+
+    def put(self, event: Event) -> None:
+        """Add an event to the store, or replace the stored event with the same ID."""
+        self.__write(event.id, event)
+
+    def remove(self, event_id: str) -> None:
+        """Remove the event with the given ID from the store, if it is there."""
+        self.__write(event_id, None)
+
+    def invalidate(self) -> None:
+        """Discard the sync token so that the next read downloads every event again."""
+        self.__sync_token = None
+        self.__synced_at = None
+
+    async def __ensure_fresh(self) -> None:
+        if self.is_stale:
+            async with self.__lock:
+                # another task may have synced while this one waited for the lock
+                if self.is_stale:
+                    await self.__sync()
+
+    async def __sync(self) -> None:
+        """Apply the changes since the last sync, or download every event if there wasn't one."""
+        try:
+            await self.__apply_changes(full=self.__sync_token is None)
+        except HttpError as error:
+            # the sync token has expired, so the whole calendar must be downloaded again
+            if error.resp.status != 410:
+                raise
+            self.__sync_token = None
+            await self.__apply_changes(full=True)
+        self.__synced_at = time.monotonic()
+
+    async def __apply_changes(self, full: bool) -> None:
+        if not full:
+            # incremental changes are applied in place, along with any concurrent writes through
+            self.__sync_token = await self.__list_events(self.__apply_change)
+            return
+        events: Dict[str, Event] = {}
+
+        def download(details: Dict[str, Any]) -> None:
+            if details.get("status") != "cancelled":
+                events[details["id"]] = self.__to_event(details)
+
+        self.__writes_during_download = {}
+        try:
+            oldest_end = datetime.now(timezone.utc) - self.__history
+            self.__sync_token = await self.__list_events(download, timeMin=oldest_end.isoformat())
+            writes = self.__writes_during_download
+        finally:
+            self.__writes_during_download = None
+        self.__events = events
+        self.__timeline = Timeline(events.values())
+        # the download may have started before the events written through since, so apply them again
+        for event_id, event in writes.items():
+            self.__write(event_id, event)
+
+    def __apply_change(self, details: Dict[str, Any]) -> None:
+        if details.get("status") == "cancelled":
+            self.remove(details["id"])
+        else:
+            self.put(self.__to_event(details))
+
+    async def __list_events(
+        self, handle: Callable[[Dict[str, Any]], None], **filters: str
+    ) -> Optional[str]:
+        """Pass every event listed by the Calendar API to `handle` and return the token for the next sync.
+
+        Args:
+            handle (Callable[[Dict[str, Any]], None]): Called with each event as returned by the API.
+            **filters (str): Extra parameters of the request, only allowed when not using the sync token.
+        """
+        page_token: Optional[str] = None
+        while True:
+            response = await self.__executor.execute(
+                self.__service.events().list(
+                    calendarId=self.__calendar_id,
+                    singleEvents=True,
+                    maxResults=self.__PAGE_SIZE,
+                    pageToken=page_token,
+                    syncToken=self.__sync_token,
+                    **filters,
+                )
+            )
+            for details in response.get("items", []):
+                handle(details)
+            page_token = response.get("nextPageToken")
+            if page_token is None:
+                return response.get("nextSyncToken")
+
+    def __write(self, event_id: str, event: Optional[Event]) -> None:
+        """Replace the stored event with the given ID with `event`, or remove it if `event` is None"""
+        old_event = self.__events.pop(event_id, None)
+        if old_event is not None:
+            self.__timeline.remove(old_event)
+        if event is not None:
+            self.__events[event_id] = event
+            self.__timeline.add(event)
+        if self.__writes_during_download is not None:
+            self.__writes_during_download[event_id] = event
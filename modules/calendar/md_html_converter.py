@@ -1,16 +1,63 @@
+import hashlib
 import re
+from collections import OrderedDict
+from typing import Callable
 
 import lxml
 import lxml.html
-from markdown import markdown
+from markdown import Markdown
 from markdownify import markdownify
 
 
+class ConversionCache:
+    """A bounded cache of the results of a text conversion, which evicts the least recently used result when full.
+
+    Results are keyed by a hash of the text rather than the text itself, so long inputs aren't kept in memory.
+    """
+
+    def __init__(self, convert: Callable[[str], str], max_size: int):
+        self.__convert = convert
+        self.__max_size = max_size
+        self.__results: OrderedDict[bytes, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of conversions whose result was found in the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __call__(self, text: str) -> str:
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        if key in self.__results:
+            self.hits += 1
+            self.__results.move_to_end(key)
+            return self.__results[key]
+        self.misses += 1
+        result = self.__results[key] = self.__convert(text)
+        if len(self.__results) > self.__max_size:
+            self.__results.popitem(last=False)
+        return result
+
+    def __str__(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.0%} hit rate)"
+
+
 def md_to_html(md: str) -> str:
-    return markdown(md)
+    return md_to_html_cache(md)
 
 
 def html_to_md(html: str) -> str:
+    return html_to_md_cache(html)
+
+
+def __convert_md_to_html(md: str) -> str:
+    # reusing one instance avoids rebuilding its parsers on every call (reset clears per-document state)
+    return __markdown.reset().convert(md)
+
+
+def __convert_html_to_md(html: str) -> str:
     root = lxml.html.fromstring(html)
     __format_links(root)
     return markdownify(lxml.html.tostring(root, encoding="unicode", method="html")).strip()
@@ -44,3 +91,10 @@ def __shorten_link(a: lxml.html.HtmlElement) -> None:
         match = __SHORT_LINK_REGEX.match(a.text or "")
         assert match is not None
         a.text = f"{match.group(1)}..." if match.group(2) else ""  # type: ignore
+
+
+__markdown = Markdown()
+
+# Event descriptions rarely change, so most conversions are of text which was converted before
+md_to_html_cache = ConversionCache(__convert_md_to_html, max_size=512)
+html_to_md_cache = ConversionCache(__convert_html_to_md, max_size=512)
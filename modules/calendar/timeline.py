@@ -0,0 +1,65 @@
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from .event import Event
+
+
+def _start(event: Event) -> datetime:
+    return event.start
+
+
+class Timeline:
+    """The events of a calendar sorted by start time, so that the events in a range of time can be found by bisection.
+
+    Finding the events in a range takes O(log n + k) time, where k is the number of events which start between the start of the range minus the duration of the longest event and the end of the range.
+    """
+
+    def __init__(self, events: Iterable[Event] = ()):
+        self.__events: List[Event] = sorted(events, key=_start)
+        # an upper bound on the duration of every event, used to find events which started before a range
+        self.__max_duration = max(
+            (event.end - event.start for event in self.__events), default=timedelta(0)
+        )
+
+    def __len__(self) -> int:
+        return len(self.__events)
+
+    def add(self, event: Event) -> None:
+        """Insert an event in its place in the timeline."""
+        insort(self.__events, event, key=_start)
+        self.__max_duration = max(self.__max_duration, event.end - event.start)
+
+    def remove(self, event: Event) -> None:
+        """Remove an event from the timeline, if it is there."""
+        index = bisect_left(self.__events, event.start, key=_start)
+        while index < len(self.__events) and self.__events[index].start == event.start:
+            if self.__events[index] is event:
+                del self.__events[index]
+                return
+            index += 1
+
+    def upcoming(self, now: datetime) -> List[Event]:
+        """The events which haven't ended yet, in chronological order"""
+        first = bisect_left(self.__events, now - self.__max_duration, key=_start)
+        return [event for event in self.__events[first:] if event.end > now]
+
+    def next(self, now: datetime) -> Optional[Event]:
+        """The first event which starts at or after the given time, if any"""
+        index = bisect_left(self.__events, now, key=_start)
+        return self.__events[index] if index < len(self.__events) else None
+
+    def between(self, start: datetime, end: datetime) -> List[Event]:
+        """The events which start in the range or are still going on at its start, in chronological order
+
+        Args:
+            start (datetime): The start of the range (inclusive).
+            end (datetime): The end of the range (exclusive).
+        """
+        first = bisect_left(self.__events, start - self.__max_duration, key=_start)
+        last = bisect_left(self.__events, end, key=_start)
+        return [
+            event
+            for event in self.__events[first:last]
+            if event.start >= start or event.end > start
+        ]
@@ -3,6 +3,7 @@ from nextcord.ext import commands, tasks
 from nextcord.ext.application_checks import has_permissions
 
 import config
+from database.course_directory import directory as course_directory
 from modules.course_management import util
 from utils.embedder import embed_success
 
@@ -113,6 +114,29 @@ class CourseManagerCog(commands.Cog):
             )
         )
 
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: nextcord.abc.GuildChannel):
+        """Reload the course directory when a channel is created in the courses categories"""
+        if isinstance(channel, nextcord.TextChannel) and util.is_course(channel):
+            course_directory.invalidate()
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: nextcord.abc.GuildChannel):
+        """Reload the course directory when a course channel is deleted"""
+        if isinstance(channel, nextcord.TextChannel) and util.is_course(channel):
+            course_directory.invalidate()
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(
+        self, before: nextcord.abc.GuildChannel, after: nextcord.abc.GuildChannel
+    ):
+        """Reload the course directory when a channel is moved into or out of the courses categories"""
+        if isinstance(after, nextcord.TextChannel) and (
+            util.is_course(after)
+            or (isinstance(before, nextcord.TextChannel) and util.is_course(before))
+        ):
+            course_directory.invalidate()
+
     @tasks.loop(hours=24)
     async def sort_courses_categories(self):
         await util.sort_courses()
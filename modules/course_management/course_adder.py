@@ -1,4 +1,4 @@
-from typing import Iterable
+from typing import Iterable, List
 
 import nextcord
 import nextcord.utils
@@ -7,12 +7,13 @@ from nextcord.abc import Messageable
 from nextcord.ext import commands
 
 import config
-from database import sql, sql_fetcher
+from database import pool, sql
+from database.course_directory import directory as course_directory
 from modules.course_management.util import ACTIVE_COURSES_CATEGORY, sort_single_course
 from utils import embedder
 from utils.utils import get_discord_obj
 
-from ..email_registry import categoriser, person_finder
+from ..email_registry import person_finder
 from ..error.friendly_error import FriendlyError
 
 
@@ -23,8 +24,20 @@ async def add_course(
     channel_name: str,
 ):
     channel = await __create_channel(interaction, channel_name, course_name)
-    await __add_to_database(interaction, channel, course_name)
-    await __link_professors(interaction, channel, professors)
+    try:
+        # add the course and link its professors in a single transaction
+        async with pool.unit_of_work():
+            category_id = await __add_to_database(interaction, channel, course_name)
+            unknown_professors = await __link_professors(interaction, category_id, professors)
+    except Exception:
+        # nothing was saved, so the channel would be left without a course
+        await channel.delete(
+            reason="The command that created this channel ultimately failed, so it was deleted."
+        )
+        raise
+    course_directory.invalidate()
+    for professor_name in unknown_professors:
+        await __warn_unknown_professor(interaction, professor_name)
     return channel
 
 
@@ -56,13 +69,10 @@ async def __add_to_database(
     interaction: nextcord.Interaction[commands.Bot],
     channel: nextcord.TextChannel,
     course_name: str,
-):
+) -> int:
     try:
-        await sql.insert("categories", returning="id", name=course_name, channel=channel.id)
+        return await sql.insert("categories", returning="id", name=course_name, channel=channel.id)
     except UniqueViolationError as e:
-        await channel.delete(
-            reason="The command that created this channel ultimately failed, so it was deleted."
-        )
         raise FriendlyError(
             "A course with this name already exists in the database.",
             description=(
@@ -77,24 +87,39 @@ async def __add_to_database(
 
 async def __link_professors(
     interaction: nextcord.Interaction[commands.Bot],
-    channel: nextcord.TextChannel,
+    category_id: int,
     professors: Iterable[str],
-):
+) -> List[str]:
+    """Link the professors to the course in one batch and return the names of those who couldn't be identified."""
+    professor_ids = set()
+    unknown_professors = []
     for professor_name in professors:
         try:
             professor = await person_finder.search_one(interaction, professor_name)
-            await categoriser.categorise_person(interaction, professor.id, (channel.mention,))
+            professor_ids.add(professor.id)
         except FriendlyError:
-            await interaction.send(
-                embed=embedder.embed_warning(
-                    title=(
-                        f'Unable to determine who you meant by "{professor_name}".'
-                        " I will skip linking this professor to the course."
-                    ),
-                    description=(
-                        "To link the professor yourself, first add them with"
-                        " `/email person add` if they're not in the system, then"
-                        " link them with `/email person link`"
-                    ),
-                )
-            )
+            unknown_professors.append(professor_name)
+    await sql.insert_many(
+        "person_category",
+        ("person", "category"),
+        ((professor_id, category_id) for professor_id in professor_ids),
+    )
+    return unknown_professors
+
+
+async def __warn_unknown_professor(
+    interaction: nextcord.Interaction[commands.Bot], professor_name: str
+):
+    await interaction.send(
+        embed=embedder.embed_warning(
+            title=(
+                f'Unable to determine who you meant by "{professor_name}".'
+                " I will skip linking this professor to the course."
+            ),
+            description=(
+                "To link the professor yourself, first add them with"
+                " `/email person add` if they're not in the system, then"
+                " link them with `/email person link`"
+            ),
+        )
+    )
@@ -2,6 +2,7 @@ import nextcord
 from nextcord.ext import commands
 
 from database import sql
+from database.course_directory import directory as course_directory
 from modules.course_management.util import is_course
 
 from ..error.friendly_error import FriendlyError
@@ -29,3 +30,4 @@ async def __delete_channel(
 
 async def __delete_from_database(channel_id: int):
     await sql.delete("categories", channel=channel_id)
+    course_directory.invalidate()
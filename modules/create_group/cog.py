@@ -2,6 +2,7 @@ import datetime
 
 from nextcord.ext import commands
 
+from modules.calendar.calendar_creator import CalendarCreationError
 from utils.scheduler import Scheduler
 
 from . import group_channel_creator
@@ -16,7 +17,7 @@ class CreateGroupCog(commands.Cog):
         """Create roles for lev and tal of the new year."""
         year = datetime.datetime.now().year + 3
         # Create group objects for each campus of the new year
-        groups = await create_groups(year)
+        groups, failures = await create_groups(year)
         # Create a channel for all the groups of the new year
         await group_channel_creator.create_group_channel(
             f"🧮︱{year}-all",
@@ -24,6 +25,9 @@ class CreateGroupCog(commands.Cog):
             "Here you can discuss links and info relevant for students from all"
             " campuses in your year.",
         )
+        # report the campuses left without a group, after setting up the ones which have one
+        if failures:
+            raise CalendarCreationError(year, failures)
 
 
 # This function will be called when this extension is loaded. It is necessary to add these functions to the bot.
@@ -1,15 +1,21 @@
-from typing import Iterable
+from typing import Dict, Iterable, Tuple
 
+from database.campus import Campus
 from modules.calendar.calendar_creator import CalendarCreator
 from modules.calendar.calendar_service import CalendarService
 
 from .new_group import NewGroup
 
 
-async def create_groups(year: int) -> Iterable[NewGroup]:
+async def create_groups(year: int) -> Tuple[Iterable[NewGroup], Dict[Campus, Exception]]:
+    """Create a group for each campus whose calendar could be created.
+
+    Returns:
+        Tuple[Iterable[NewGroup], Dict[Campus, Exception]]: The new groups, and the reason why each campus which has no new group couldn't get a calendar.
+    """
     calendar_creator = CalendarCreator(CalendarService("Asia/Jerusalem"))
-    calendars = await calendar_creator.create_group_calendars(year)
+    calendars, failures = await calendar_creator.create_group_calendars(year)
     groups = [NewGroup(campus, year, calendar) for campus, calendar in calendars.items()]
     for new_group in groups:
         await new_group.add_to_system()
-    return groups
+    return groups, failures
@@ -3,7 +3,7 @@ import nextcord
 import config
 from database import sql
 from database.campus import Campus
-from database.group import Group
+from database.group_directory import directory
 from modules.calendar.calendar import Calendar
 
 from . import group_channel_creator
@@ -72,7 +72,7 @@ class NewGroup:
         )
 
     async def __move_role(self):
-        roles = [group.role for group in await Group.get_groups()]
+        roles = [group.role for group in await directory.groups()]
         positions = [role.position for role in roles]
         new_position = min(positions) - 1
         position_dict = {self.role: new_position}
@@ -99,3 +99,4 @@ class NewGroup:
             role=self.role.id,
             calendar=self.calendar.id,
         )
+        directory.invalidate()
@@ -0,0 +1,57 @@
+import nextcord
+from nextcord.ext import application_checks, commands
+
+import config
+from database import pool, query_stats
+from utils.embedder import MAX_EMBED_DESCRIPTION_LENGTH, build_embed
+from utils.utils import trim
+
+
+class DatabaseStatsCog(commands.Cog):
+    """Show how long database queries are taking"""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @nextcord.slash_command(name="database", guild_ids=[config.guild_id])
+    async def database(self, interaction: nextcord.Interaction[commands.Bot]):
+        """This is a base command for all database commands and is not invoked"""
+        pass
+
+    @database.subcommand(name="stats")
+    @application_checks.has_guild_permissions(manage_guild=True)
+    async def stats(
+        self,
+        interaction: nextcord.Interaction[commands.Bot],
+        # more lines than this don't fit in an embed
+        limit: int = nextcord.SlashOption(min_value=1, max_value=10, default=10),
+    ):
+        """Show which tables and statements have taken the most time since the bot started.
+
+        Args:
+            limit: The number of tables and statements to show (default is 10).
+        """
+        await interaction.send(
+            embed=build_embed(
+                title="🗄️ Database Stats",
+                description=trim(query_stats.summary(limit), MAX_EMBED_DESCRIPTION_LENGTH),
+                footer=f"Connection pool: {pool.stats}",
+            ),
+            ephemeral=True,
+        )
+
+    @database.subcommand(name="slow")
+    @application_checks.has_guild_permissions(manage_guild=True)
+    async def slow(self, interaction: nextcord.Interaction[commands.Bot], num_lines: int = 20):
+        """Show the most recent entries in the slow query log.
+
+        Args:
+            num_lines: The number of entries to show (default is 20).
+        """
+        lines = "".join(query_stats.read_slow_queries(num_lines)) or "No slow queries logged."
+        await interaction.send(f"```{lines[-1990:]}```", ephemeral=True)
+
+
+# setup functions for bot
+def setup(bot: commands.Bot):
+    bot.add_cog(DatabaseStatsCog(bot))
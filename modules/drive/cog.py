@@ -66,7 +66,7 @@ class DriveCog(commands.Cog):
         email_message = info_message.replace("[Drive Guidelines]", "Drive Guidelines ")
         # add manager to Drive
         try:
-            self.service.add_manager(email=email, email_message=email_message)
+            await self.service.add_manager(email=email, email_message=email_message)
         except Exception as e:
             raise FriendlyError(
                 "An error occurred while applying changes.",
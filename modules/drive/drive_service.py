@@ -1,19 +1,13 @@
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-
-import config
+from utils import google_clients
 
 
 class DriveService:
     def __init__(self, folder_id: str):
-        SCOPES = ["https://www.googleapis.com/auth/drive"]
-        self.creds = service_account.Credentials.from_service_account_info(
-            config.google_config, scopes=SCOPES
-        )
-        self.service = build("drive", "v3", credentials=self.creds)
+        self.service = google_clients.client("drive", "v3")
+        self.executor = google_clients.executor()
         self.folder_id = folder_id
 
-    def add_manager(self, email: str, email_message: str) -> None:
+    async def add_manager(self, email: str, email_message: str) -> None:
         """Gives write access to the Google Drive folder given an email address
 
         Args:
@@ -29,14 +23,12 @@ class DriveService:
             "type": "user",
             "emailAddress": email,
         }
-        created_permission = (
-            self.service.permissions()
-            .create(
+        created_permission = await self.executor.execute(
+            self.service.permissions().create(
                 fileId=self.folder_id,
                 body=rule,
                 fields="emailAddress",
                 emailMessage=email_message,
             )
-            .execute()
         )
         assert created_permission["emailAddress"] == email
@@ -3,8 +3,7 @@ from typing import Iterable
 import nextcord
 from nextcord.ext import commands
 
-import config
-from database import sql_fetcher
+from database import pool, sql_fetcher
 from database.person import Person
 from utils.mention import decode_channel_mention
 
@@ -39,16 +38,19 @@ async def __add_remove_categories(
     person_id: int,
     channel_mentions: Iterable[str],
 ) -> Person:
-    conn = await config.get_connection()
     query = sql_fetcher.fetch("modules", "email_registry", "queries", sql_file)
-    async with conn.transaction():
-        for channel in channel_mentions:
-            channel_id = decode_channel_mention(channel)
-            if channel_id is None:
-                raise FriendlyError(
-                    f'Expected a channel mention in place of "{channel}".',
-                    interaction,
-                    interaction.user,
-                )
-            await conn.execute(query, person_id, channel_id)
+    rows = []
+    for channel in channel_mentions:
+        channel_id = decode_channel_mention(channel)
+        if channel_id is None:
+            raise FriendlyError(
+                f'Expected a channel mention in place of "{channel}".',
+                interaction,
+                interaction.user,
+            )
+        rows.append((person_id, channel_id))
+    if rows:
+        # executemany sends all the rows in one batch and applies them atomically
+        async with pool.acquire() as conn:
+            await conn.executemany(query, rows)
     return await Person.get_person(person_id)
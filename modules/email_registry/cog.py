@@ -5,6 +5,7 @@ from nextcord.channel import TextChannel
 from nextcord.ext import application_checks, commands
 
 import config
+from database import pool
 from database.person import Person
 from modules.email_registry import person_remover
 from utils.embedder import embed_success
@@ -121,11 +122,22 @@ class EmailRegistryCog(commands.Cog):
                 channels: Mention the channels this person is associated with.
         """
         await interaction.response.defer()
-        person = await person_adder.add_person(
-            first_name, last_name, extract_channel_mentions(channels), interaction
-        )
-        if email is not None:
-            person = await email_adder.add_email(person, email, interaction)
+        email_error: Optional[FriendlyError] = None
+        # add the person and their email in one transaction
+        async with pool.unit_of_work():
+            person = await person_adder.add_person(
+                first_name, last_name, extract_channel_mentions(channels), interaction
+            )
+            if email is not None:
+                try:
+                    # a savepoint, so that the person is still added if the email is rejected
+                    async with pool.unit_of_work():
+                        person = await email_adder.add_email(person, email, interaction)
+                except FriendlyError as error:
+                    email_error = error
+        # report the rejected email once the person has been committed
+        if email_error is not None:
+            raise email_error
         await interaction.send(embed=person_embedder.gen_embed(person))
 
     @email.subcommand(name="remove")
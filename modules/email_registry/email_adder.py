@@ -25,7 +25,7 @@ async def add_email(person: Person, email: str, sender: nextcord.Interaction) ->
             person=person.id,
             email=email,
         )
-        return await Person.get_person(person.id)
+        return person.with_email(email)
     except UniqueViolationError as e:
         raise FriendlyError(
             f"Ignoring request to add {email} to {person.name}; it is already in the" " system.",
@@ -51,4 +51,4 @@ async def remove_email(person: Person, email: str) -> Person:
             Person: The new person object without the email address that was removed.
     """
     await sql.delete("emails", person=person.id, email=email.strip())
-    return await Person.get_person(person.id)
+    return person.without_email(email.strip())
@@ -3,7 +3,7 @@ from typing import Iterable
 import nextcord
 from nextcord.ext import commands
 
-from database import sql
+from database import pool, sql
 from database.person import Person
 
 from . import categoriser
@@ -15,7 +15,8 @@ async def add_person(
     channel_mentions: Iterable[str],
     interaction: nextcord.Interaction[commands.Bot],
 ) -> Person:
-    person_id = await sql.insert(
-        "people", returning="id", name=name.capitalize(), surname=surname.capitalize()
-    )
-    return await categoriser.categorise_person(interaction, person_id, channel_mentions)
+    async with pool.unit_of_work():
+        person_id = await sql.insert(
+            "people", returning="id", name=name.capitalize(), surname=surname.capitalize()
+        )
+        return await categoriser.categorise_person(interaction, person_id, channel_mentions)
@@ -22,23 +22,18 @@ async def search(
     email: Optional[str] = None,
 ) -> Set[Person]:
     """returns a list of people who best match the name and channel"""
-    weights = WeightedSet()
-
-    # add the people belonging to the category of the given channel (if any)
-    if channel:
-        for person in await Person.search_by_channel(channel.id):
-            weights[person] += __search_weights["channel"]
+    if not (name or channel or email):
+        return set()
 
-    # search their name
-    if name:
-        for word in name.split():
-            for person, similarity in await Person.search_by_name(word):
-                weights[person] += __search_weights["word"] * similarity
-
-    # add the people who have the email mentioned
-    if email:
-        for person in await Person.search_by_email(email):
-            weights[person] += __search_weights["email"]
+    # score every person against the name, channel and email in one query
+    weights = WeightedSet()
+    for person, weight in await Person.search_weighted(
+        name.split() if name else [],
+        channel.id if channel else None,
+        email,
+        __search_weights,
+    ):
+        weights[person] = weight
 
     return weights.heaviest_items()
 
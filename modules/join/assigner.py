@@ -2,12 +2,16 @@ import random
 from functools import cache
 
 import nextcord
+from nextcord.ext import commands
 from pyluach.dates import HebrewDate
 
 import config
-from database import sql
+from database.group import Group
+from database.group_directory import directory
 from utils import utils
 
+from ..error.friendly_error import FriendlyError
+
 
 @cache
 def __unassigned_role() -> nextcord.Role:
@@ -30,35 +34,55 @@ def __welcome_channel() -> nextcord.TextChannel:
     return channel
 
 
-async def assign(member: nextcord.Member, name: str, campus_id: int, year: int):
+async def assign(
+    interaction: nextcord.Interaction[commands.Bot],
+    member: nextcord.Member,
+    name: str,
+    campus_id: int,
+    year: int,
+):
     """Assigns a user who joined the server.
 
     Sets the user's nickname to their full name, adds the role for the class they're in, and replaces the unassigned role with the assigned role. Following this, it welcomes the user in #off-topic.
 
     Args:
+        interaction (nextcord.Interaction): The interaction to use to report errors.
         member (nextcord.Member): The member to assign.
         name (str): The member's full name.
         campus_id (int): The ID of the campus they study in.
         year (int): The index of the year they're in. This should be a number from 1 to 4.
     """
     if __unassigned_role() in member.roles:
+        # find the group before changing anything, so that the member isn't left half assigned
+        group = await __find_group(interaction, campus_id, year)
         await member.edit(nick=name)
-        await __add_role(member, campus_id, year)
+        await member.add_roles(nextcord.Object(group.role_id))
         await member.add_roles(nextcord.Object(__student_role().id))
         await member.remove_roles(nextcord.Object(__unassigned_role().id))
         await server_welcome(member)
 
 
-async def __add_role(member: nextcord.Member, campus_id: int, year: int):
-    """adds the right role to the user that used the command"""
+async def __find_group(
+    interaction: nextcord.Interaction[commands.Bot], campus_id: int, year: int
+) -> Group:
+    """finds the group of the given campus and year whose role should be given to the user"""
     today = HebrewDate.today()
     assert today is not None
     last_elul_year = today.year if today.month == 6 else today.year - 1
     last_elul = HebrewDate(last_elul_year, 6, 1)
     base_year = last_elul.to_pydate().year
     grad_year = base_year + 4 - year
-    role_id = await sql.select.value("groups", "role", campus=campus_id, grad_year=grad_year)
-    await member.add_roles(nextcord.Object(role_id))
+    group = await directory.get_group_by_campus_year(campus_id, grad_year)
+    if group is None:
+        campus = await directory.get_campus(campus_id)
+        raise FriendlyError(
+            f"There is no class for year {year} in"
+            f" {campus.name if campus else f'campus {campus_id}'} (graduating in {grad_year}).",
+            interaction,
+            interaction.user,
+            description="Please ask an admin to create the class.",
+        )
+    return group
 
 
 async def server_welcome(member: nextcord.Member):
@@ -4,6 +4,7 @@ from nextcord.ext import application_checks, commands
 import config
 from database import preloaded
 from utils import embedder, utils
+from utils.utils import set_option_choices
 
 from . import assigner
 
@@ -14,6 +15,7 @@ class JoinCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.assigner = None
+        preloaded.add_listener(self.__update_campus_choices)
 
     @nextcord.slash_command("join", guild_ids=[config.guild_id])
     @application_checks.has_role(utils.get_id("UNASSIGNED_ROLE"))
@@ -41,6 +43,7 @@ class JoinCog(commands.Cog):
         assert interaction.application_command
         await interaction.response.defer()
         await assigner.assign(
+            interaction,
             interaction.user,
             f"{first_name.title()} {last_name.title()}",
             campus,
@@ -57,6 +60,12 @@ class JoinCog(commands.Cog):
             ]
         )
 
+    async def __update_campus_choices(self):
+        """Update the choices of the campus option after the campuses have changed."""
+        set_option_choices(
+            self.join, "campus", {campus.name: campus.id for campus in preloaded.campuses}
+        )
+
 
 # setup functions for bot
 def setup(bot: commands.Bot):
@@ -0,0 +1,121 @@
+"""
+This module parses dates written by users, such as "April 15, 2pm" or "מחר".
+
+Only the languages in `LANGUAGES` are considered, which spares dateparser from
+detecting the language of every input. Common formats (ISO dates, "today" or
+"tomorrow" with a time, and a month and day with an optional year and time)
+are parsed directly without dateparser at all, and results are cached by
+input and base date. Call `warm_up()` at startup so that dateparser loads its
+language data then rather than during the first command which needs it.
+"""
+
+import calendar
+import re
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from dateparser.date import DateDataParser
+
+# The languages dates may be written in
+LANGUAGES = ("en", "he")
+
+__MONTHS = {
+    name.lower(): number
+    for names in (calendar.month_name, calendar.month_abbr)
+    for number, name in enumerate(names)
+    if name
+}
+__TIME = r"(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<meridiem>am|pm)?"
+__ISO_REGEX = re.compile(r"^2\d{3}-[01]\d-[0-3]\d\S*$")
+__NAIVE_ISO_REGEX = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[t ]\d{2}:\d{2}(?::\d{2})?)?$")
+__RELATIVE_REGEX = re.compile(rf"^(?P<day>today|tomorrow)(?:\s+at)?\s+{__TIME}$")
+__ABSOLUTE_REGEX = re.compile(
+    r"^(?P<month>[a-z]+)\.?\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?(?:,?\s+(?P<year>\d{4}))?"
+    rf"(?:(?:,\s*|\s+)(?:at\s+)?{__TIME})?$"
+)
+
+
+def warm_up() -> None:
+    """Load dateparser's data for all the languages in `LANGUAGES`."""
+    DateDataParser(languages=list(LANGUAGES)).get_date_data("1 January 2000")
+    DateDataParser(languages=list(LANGUAGES)).get_date_data("מחר")
+
+
+@lru_cache(maxsize=1024)
+def parse(
+    date_str: str, from_tz: Optional[str], to_tz: Optional[str], future: bool, base: datetime
+) -> Optional[datetime]:
+    """Parse a date written by a user. See `utils.utils.parse_date` for the meaning of the arguments.
+
+    Results are cached, so `base` should be rounded (to the minute, for example) by the caller.
+    """
+    # the fast path doesn't convert between timezones
+    result = (
+        None if from_tz or to_tz else __parse_common_format(date_str.strip().lower(), future, base)
+    )
+    if result is None:
+        # set dateparser settings
+        settings: Dict[str, Any] = {
+            "RELATIVE_BASE": base,
+            **({"TIMEZONE": from_tz} if from_tz else {}),
+            **({"TO_TIMEZONE": to_tz} if to_tz else {}),
+            **({"PREFER_DATES_FROM": "future"} if future else {}),
+        }
+        # parse the date with dateparser
+        result = DateDataParser(languages=list(LANGUAGES), settings=settings).get_date_data(
+            date_str
+        )["date_obj"]
+    # make times PM if time is early in the day, base is PM, and no indication that AM was specified
+    if (
+        result
+        and result.hour < 8  # hour is before 8:00
+        and base.hour >= 12  # relative base is PM
+        and not "am" in date_str.lower()  # am is not specified
+        and not __ISO_REGEX.match(date_str)  # not in iso format
+    ):
+        result += timedelta(hours=12)
+    return result
+
+
+def __parse_common_format(date_str: str, future: bool, base: datetime) -> Optional[datetime]:
+    """Parse the date without dateparser if it is in one of the common formats, otherwise return None.
+    The results are the same as dateparser would give."""
+    try:
+        if __NAIVE_ISO_REGEX.match(date_str):
+            return datetime.fromisoformat(date_str.upper())
+        if match := __RELATIVE_REGEX.match(date_str):
+            day = base.date() + timedelta(days=match["day"] == "tomorrow")
+            clock = __parse_time(match)
+            return datetime.combine(day, clock) if clock else None
+        if (match := __ABSOLUTE_REGEX.match(date_str)) and match["month"] in __MONTHS:
+            clock = time()
+            if match["hour"]:
+                clock = __parse_time(match)
+                if clock is None:
+                    return None
+            year = int(match["year"] or base.year)
+            result = datetime.combine(
+                date(year, __MONTHS[match["month"]], int(match["day"])), clock
+            )
+            # dateparser moves dates without a year which have already passed to the next year
+            if future and not match["year"] and result <= base:
+                result = result.replace(year=year + 1)
+            return result
+    except ValueError:
+        # the date doesn't exist (eg. "February 30"), so let dateparser decide what to do
+        pass
+    return None
+
+
+def __parse_time(match: re.Match) -> Optional[time]:
+    """The time of day matched by the time pattern, or None if it is ambiguous (eg. a bare "3")"""
+    hour = int(match["hour"])
+    minute = int(match["minute"] or 0)
+    if match["meridiem"]:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if match["meridiem"] == "pm" else 0)
+    elif match["minute"] is None:
+        return None
+    return time(hour, minute)
@@ -0,0 +1,86 @@
+"""
+This module builds the Google API clients used by the bot.
+
+Each client is built only once, from the discovery document bundled with the
+Google API client library rather than one fetched over the network. All the
+clients share one set of service account credentials, so an access token
+refreshed for one of them is reused by the others, and one `GoogleExecutor`
+to run their requests.
+
+Call `warm_up()` at startup to build the clients before they are first needed.
+"""
+
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from google.oauth2 import service_account
+from googleapiclient.discovery import build
+
+import config
+
+from .google_executor import GoogleExecutor
+
+# The scopes requested for the shared credentials, covering every API the bot uses
+SCOPES: Sequence[str] = (
+    "https://www.googleapis.com/auth/calendar",
+    "https://www.googleapis.com/auth/drive",
+)
+
+# The APIs whose clients are built by warm_up(), as (name, version) pairs
+APIS: Sequence[Tuple[str, str]] = (("calendar", "v3"), ("drive", "v3"))
+
+# Seconds it took to build each client, keyed by "<name> <version>"
+build_times: Dict[str, float] = {}
+
+__credentials: Optional[service_account.Credentials] = None
+__executor: Optional[GoogleExecutor] = None
+__clients: Dict[Tuple[str, str], Any] = {}
+
+
+def credentials() -> service_account.Credentials:
+    """The service account credentials shared by all the clients."""
+    global __credentials
+    if __credentials is None:
+        __credentials = service_account.Credentials.from_service_account_info(
+            config.google_config, scopes=SCOPES
+        )
+    return __credentials
+
+
+def executor() -> GoogleExecutor:
+    """The executor which runs the requests of all the clients."""
+    global __executor
+    if __executor is None:
+        __executor = GoogleExecutor(
+            credentials(),
+            config.google_api_max_workers,
+            config.google_api_timeout,
+            config.google_api_batch_timeout,
+        )
+    return __executor
+
+
+def client(name: str, version: str) -> Any:
+    """Get the client of a Google API, building it if this is the first time it is requested.
+
+    Args:
+        name (str): The name of the API (eg. "calendar").
+        version (str): The version of the API (eg. "v3").
+    """
+    if (name, version) not in __clients:
+        start = time.perf_counter()
+        __clients[(name, version)] = build(
+            name, version, credentials=credentials(), static_discovery=True, cache_discovery=False
+        )
+        build_times[f"{name} {version}"] = time.perf_counter() - start
+    return __clients[(name, version)]
+
+
+def warm_up() -> None:
+    """Build the clients of all the APIs listed in `APIS` and print how long it took."""
+    for name, version in APIS:
+        client(name, version)
+    print(
+        "Built Google API clients: "
+        + ", ".join(f"{api} in {seconds * 1000:.0f}ms" for api, seconds in build_times.items())
+    )
@@ -0,0 +1,117 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import google_auth_httplib2
+import httplib2
+from google.auth.credentials import Credentials
+from googleapiclient.http import HttpRequest
+
+
+class GoogleExecutor:
+    """Runs requests built with the Google API client without blocking the event loop.
+
+    The client library only makes blocking HTTP calls, and its underlying `httplib2.Http` object is not thread safe. So each request is executed on a bounded pool of worker threads, each of which has its own authorised `Http` instance.
+    """
+
+    # maximum number of requests the Google APIs accept in a single batch request
+    __BATCH_SIZE = 50
+
+    def __init__(
+        self,
+        credentials: Credentials,
+        max_workers: int,
+        timeout: float,
+        batch_timeout: float,
+        num_retries: int = 1,
+    ):
+        """Create an executor for requests authorised with the given credentials.
+
+        Args:
+            credentials (Credentials): The credentials to authorise the requests with.
+            max_workers (int): The maximum number of requests which may run at once. Additional requests wait for a worker to become free.
+            timeout (float): The number of seconds after which a request is abandoned.
+            batch_timeout (float): The number of seconds after which a batch request is abandoned. A batch holds many requests, so this should be longer than `timeout`.
+            num_retries (int, optional): The number of times to retry a request which fails with a server error. Defaults to 1.
+        """
+        self.__credentials = credentials
+        self.__timeout = timeout
+        self.__batch_timeout = batch_timeout
+        self.__num_retries = num_retries
+        self.__pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="google-api")
+        self.__local = threading.local()
+
+    async def execute(self, request: HttpRequest) -> Any:
+        """Execute a request on a worker thread and return its response.
+
+        Raises:
+            asyncio.TimeoutError: If the request didn't complete within the timeout.
+            googleapiclient.errors.HttpError: If the API responded with an error.
+        """
+        return await self.__run(self.__timeout, self.__execute, request)
+
+    async def execute_batch(
+        self, service: Any, requests: Mapping[str, HttpRequest]
+    ) -> Dict[str, Any]:
+        """Execute several requests to the same API using as few batch requests as possible.
+
+        A request which fails doesn't prevent the others from being executed. Batches are sent concurrently if there are too many requests for one. If a whole batch fails (for example, if it times out), each of its requests is given the exception the batch failed with.
+
+        Args:
+            service (Any): The API client which built the requests.
+            requests (Mapping[str, HttpRequest]): The requests to execute, keyed by an ID of your choice.
+
+        Returns:
+            Dict[str, Any]: The response to each request, or the exception it failed with, keyed by the request's ID.
+        """
+        ids = list(requests)
+        chunks = [ids[i : i + self.__BATCH_SIZE] for i in range(0, len(ids), self.__BATCH_SIZE)]
+        results: Dict[str, Any] = {}
+        chunk_results = await asyncio.gather(
+            *(
+                self.__run(
+                    self.__batch_timeout,
+                    self.__execute_batch,
+                    service,
+                    {id: requests[id] for id in chunk},
+                )
+                for chunk in chunks
+            ),
+            return_exceptions=True,
+        )
+        for chunk, chunk_result in zip(chunks, chunk_results):
+            if isinstance(chunk_result, Exception):
+                results.update({id: chunk_result for id in chunk})
+            elif isinstance(chunk_result, BaseException):
+                raise chunk_result
+            else:
+                results.update(chunk_result)
+        return results
+
+    async def __run(self, timeout: float, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(loop.run_in_executor(self.__pool, func, *args), timeout)
+
+    def __execute(self, request: HttpRequest) -> Any:
+        return request.execute(http=self.__http(), num_retries=self.__num_retries)
+
+    def __execute_batch(self, service: Any, requests: Mapping[str, HttpRequest]) -> Dict[str, Any]:
+        results: Dict[str, Any] = {}
+
+        def callback(request_id: str, response: Any, exception: Optional[Exception]):
+            results[request_id] = exception if exception is not None else response
+
+        batch = service.new_batch_http_request(callback=callback)
+        for request_id, request in requests.items():
+            batch.add(request, request_id=request_id)
+        batch.execute(http=self.__http())
+        return results
+
+    def __http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """The authorised Http instance belonging to the current worker thread."""
+        if not hasattr(self.__local, "http"):
+            self.__local.http = google_auth_httplib2.AuthorizedHttp(
+                self.__credentials, http=httplib2.Http(timeout=self.__timeout)
+            )
+        return self.__local.http
@@ -81,5 +81,10 @@ class Scheduler:
 
     async def __trigger_event(self, name: str, on_complete):
         print(f"Triggering event: {name}")
-        await Scheduler.events[name].fire(self.bot)
-        on_complete()
+        try:
+            await Scheduler.events[name].fire(self.bot)
+        except Exception:
+            # nobody awaits the event, so pass the error to the bot's error handler to be logged
+            await self.bot.on_error(name)
+        finally:
+            on_complete()
@@ -3,12 +3,15 @@ import os
 import re
 from asyncio import sleep
 from datetime import datetime, timedelta
-from typing import Any, Dict, Iterable, Optional, TypeVar
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, TypeVar, Union
+from zoneinfo import ZoneInfo
 
-import dateparser
 import nextcord
 from nextcord.abc import Messageable
 
+from . import date_parser
+
 
 class IdNotFoundError(Exception):
     def __init__(self, *args: object) -> None:
@@ -57,7 +60,7 @@ def parse_date(
     from_tz: Optional[str] = None,
     to_tz: Optional[str] = None,
     future: Optional[bool] = None,
-    base: datetime = datetime.now(),
+    base: Optional[datetime] = None,
 ) -> Optional[datetime]:
     """Returns datetime object for given date string
     Arguments:
@@ -65,30 +68,36 @@ def parse_date(
     :param from_tz: :class:`Optional[str]` string representing the timezone to interpret the date as (eg. "Asia/Jerusalem")
     :param to_tz: :class:`Optional[str]` string representing the timezone to return the date in (eg. "Asia/Jerusalem")
     :param future: :class:`Optional[bool]` set to true to prefer dates from the future when parsing
-    :param base: :class:`datetime` datetime representing where dates should be parsed relative to
+    :param base: :class:`Optional[datetime]` datetime representing where dates should be parsed relative to (default: now)
     """
     if date_str is None:
         return None
-    # set dateparser settings
-    settings: Dict[str, Any] = {
-        "RELATIVE_BASE": base.replace(tzinfo=None),
-        **({"TIMEZONE": from_tz} if from_tz else {}),
-        **({"TO_TIMEZONE": to_tz} if to_tz else {}),
-        **({"PREFER_DATES_FROM": "future"} if future else {}),
-    }
-    # parse the date with dateparser
-    date = dateparser.parse(date_str, settings=settings)  # type: ignore
-    # make times PM if time is early in the day, base is PM, and no indication that AM was specified
-    if (
-        date
-        and date.hour < 8  # hour is before 8:00
-        and base.hour >= 12  # relative base is PM
-        and not "am" in date_str.lower()  # am is not specified
-        and not re.match(r"^2\d{3}-[01]\d-[0-3]\d\S*$", date_str)  # not in iso format
-    ):
-        date += timedelta(hours=12)
-    # return the datetime object
-    return date
+    # parse relative to the start of the minute, so that repeated inputs within a minute are cached
+    base = (base or datetime.now()).replace(tzinfo=None, second=0, microsecond=0)
+    return date_parser.parse(date_str, from_tz, to_tz, bool(future), base)
+
+
+@lru_cache(maxsize=None)
+def get_timezone(name: str) -> ZoneInfo:
+    """Returns the timezone object for the given IANA timezone name (eg. "Asia/Jerusalem")"""
+    return ZoneInfo(name)
+
+
+def parse_api_datetime(timestamp: str, from_tz: str, to_tz: str) -> datetime:
+    """Returns the datetime represented by a machine generated RFC 3339 timestamp or ISO 8601 date,
+    such as those returned by the Google Calendar API. Much faster than parse_date for these.
+    Arguments:
+    :param timestamp: :class:`str` the timestamp (eg. "2021-04-15T14:00:00+03:00" or "2021-04-15")
+    :param from_tz: :class:`str` string representing the timezone to interpret the timestamp as if it has no offset
+    :param to_tz: :class:`str` string representing the timezone to return the datetime in
+    """
+    # fromisoformat doesn't accept the "Z" suffix before Python 3.11
+    date = datetime.fromisoformat(
+        timestamp[:-1] + "+00:00" if timestamp.endswith("Z") else timestamp
+    )
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=get_timezone(from_tz))
+    return date.astimezone(get_timezone(to_tz))
 
 
 def format_date(date: datetime, base: datetime = datetime.now(), all_day: bool = False) -> str:
@@ -116,6 +125,22 @@ def format_date(date: datetime, base: datetime = datetime.now(), all_day: bool =
     return date.strftime(date_format).replace(" 0", " ").strip()
 
 
+def set_option_choices(
+    command: Union[nextcord.SlashApplicationCommand, nextcord.SlashApplicationSubcommand],
+    option_name: str,
+    choices: Dict[str, Any],
+) -> None:
+    """Replace the choices of every option with the given name in a slash command and all its subcommands.
+
+    The change only reaches Discord once the application commands are synced.
+    """
+    option = command.options.get(option_name)
+    if option is not None:
+        option.choices = choices
+    for subcommand in command.children.values():
+        set_option_choices(subcommand, option_name, choices)
+
+
 T = TypeVar("T")
 
 